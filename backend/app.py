@@ -1,21 +1,52 @@
 # backend/app.py (updated with chatbot integration)
-import math, json, pathlib
+import heapq, math, json, pathlib
 from rapidfuzz import process, fuzz  # pip install rapidfuzz
 import sys, os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from dotenv import load_dotenv
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from schemas import PredictRequest, PredictResponse
-from utils import average, decision_label, recommendations
+from schemas import PredictDetails, PredictResponse, SCORE_INDEX
+from schemas_fast import decode_predict_request
+from utils import nan_average, decision_label, recommendations
 
 from models import UnimatchDummyModel
 from llm_scorer import LLMScorer
 from chatbot import EducationChatbot
+from semantic_cache import SemanticCache
+
+# Optional: faster JSON encoding/decoding (pip install orjson)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 load_dotenv()
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson; keys sorted like the default provider, numpy values allowed"""
+    option = 0 if orjson is None else orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj, **kwargs):
+        # json.dumps formatting kwargs (separators, indent): orjson output is already compact
+        option = self.option | (orjson.OPT_INDENT_2 if kwargs.get("indent") else 0)
+        return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Straight to bytes, no str round trip; pretty-printed in debug like the default
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self.option | orjson.OPT_APPEND_NEWLINE
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(orjson.dumps(obj, default=self.default, option=option), mimetype=self.mimetype)
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 CORS(app)
 
 # -------------------------------------------------------
@@ -32,10 +63,23 @@ ROOT = pathlib.Path(__file__).resolve().parents[1]
 MAJORS_KB_PATH = ROOT / "kb" / "majors.json"
 STUDENT_DATA_PATH = ROOT / "data" / "student_data.xlsx"  # Path to your student Excel data
 
+# Optional semantic cache for near-duplicate chatbot messages
+semantic_cache = None
+if os.getenv("CHATBOT_SEMANTIC_CACHE", "0") in {"1", "true", "True"}:
+    try:
+        semantic_cache = SemanticCache(
+            db_path=os.getenv("CHATBOT_SEMANTIC_CACHE_DB", ":memory:"),
+            threshold=float(os.getenv("CHATBOT_SEMANTIC_CACHE_THRESHOLD", "0.9")),
+            ttl=float(os.getenv("CHATBOT_SEMANTIC_CACHE_TTL", str(24 * 3600))),
+        )
+    except Exception as e:
+        print(f"Semantic cache disabled: {e}")
+
 # Initialize chatbot
 chatbot = EducationChatbot(
     majors_kb_path=str(MAJORS_KB_PATH),
-    student_data_path=str(STUDENT_DATA_PATH) if STUDENT_DATA_PATH.exists() else None
+    student_data_path=str(STUDENT_DATA_PATH) if STUDENT_DATA_PATH.exists() else None,
+    semantic_cache=semantic_cache
 )
 
 # -------------------------------------------------------
@@ -66,6 +110,39 @@ def kb_stats():
 # -------------------------------------------------------
 # Chatbot API
 # -------------------------------------------------------
+# The chatbot hands out shared, read-only responses (cached singletons and
+# memoized replies), so each one is JSON-encoded once. Keyed by id(); the
+# response itself is kept in the entry so the id cannot be reused.
+CHATBOT_FRAME_CACHE_SIZE = 1024
+_chatbot_frames = {}
+
+def _chatbot_frames_for(response):
+    """Pre-encoded (head, middle) JSON around the per-request intent and timestamp"""
+    entry = _chatbot_frames.get(id(response))
+    if entry is not None and entry[0] is response:
+        return entry[1]
+    
+    def dumps(obj):
+        return app.json.dumps(obj, separators=(",", ":"))
+    
+    # Keys in sorted order, matching jsonify
+    head = '{"confidence":' + dumps(response.confidence) + ',"intent":'
+    middle = (
+        ',"recommendations":' + dumps(response.recommendations)
+        + ',"response":' + dumps(response.message)
+        + ',"study_plan":' + dumps([
+            {"subject": plan.subject, "topics": plan.topics, "difficulty": plan.difficulty}
+            for plan in response.study_plan
+        ])
+        + ',"timestamp":'
+    )
+    frames = (head.encode("utf-8"), middle.encode("utf-8"))
+    
+    if len(_chatbot_frames) >= CHATBOT_FRAME_CACHE_SIZE:
+        _chatbot_frames.clear()
+    _chatbot_frames[id(response)] = (response, frames)
+    return frames
+
 @app.post("/api/chatbot")
 def chatbot_endpoint():
     """Handle chatbot conversations"""
@@ -78,22 +155,16 @@ def chatbot_endpoint():
         
         # Process message with chatbot
         response = chatbot.process_message(message)
+        head, middle = _chatbot_frames_for(response)
         
-        return jsonify({
-            "response": response.message,
-            "recommendations": response.recommendations,
-            "study_plan": [
-                {
-                    "subject": plan.subject,
-                    "topics": plan.topics,
-                    "difficulty": plan.difficulty
-                }
-                for plan in response.study_plan
-            ],
-            "confidence": response.confidence,
-            "intent": chatbot.detect_intent(message),
-            "timestamp": __import__('datetime').datetime.now().isoformat()
-        })
+        body = b"".join((
+            head,
+            app.json.dumps(chatbot.detect_intent(message)).encode("utf-8"),
+            middle,
+            app.json.dumps(__import__('datetime').datetime.now().isoformat()).encode("utf-8"),
+            b"}\n",
+        ))
+        return app.response_class(body, mimetype="application/json")
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -251,8 +322,7 @@ def _top_per_university(items, per_uni=2):
         by.setdefault(it["university"], []).append(it)
     out = []
     for uni, lst in by.items():
-        lst.sort(key=lambda x: x["probability"], reverse=True)
-        out.extend(lst[:per_uni])
+        out.extend(heapq.nlargest(per_uni, lst, key=lambda x: x["probability"]))
     return out
 
 def _find_best_match_for_university_major_pair(majors_kb, target_university, target_major):
@@ -311,34 +381,34 @@ def _find_best_match_for_university_major_pair(majors_kb, target_university, tar
 # -------------------------------------------------------
 # Predict
 # -------------------------------------------------------
+# Grade-vector columns averaged into rapor_avg and, per program, core_avg
+RAPOR_COLUMNS = [SCORE_INDEX[k] for k in ("s1", "s2", "s3", "s4", "s5")]
+CORE_COLUMNS = {
+    "saintek": [SCORE_INDEX[k] for k in ("math", "language", "physics", "chemistry", "biology")],
+    "soshum": [SCORE_INDEX[k] for k in ("math", "language", "economics", "geography", "history")],
+}
+
 @app.post("/api/predict")
 def predict():
     try:
-        raw = request.get_json(force=True, silent=False)
-        
-        # Handle both old and new payload formats
-        # Priority: target_university_1 + target_major_1 > target_major (legacy)
-        if raw.get("target_university_1") and raw.get("target_major_1"):
-            raw["target_university"] = raw["target_university_1"]
-            raw["target_major"] = raw["target_major_1"]
-        elif not raw.get("target_major") and isinstance(raw.get("target_majors"), list) and raw["target_majors"]:
-            raw["target_major"] = raw["target_majors"][0]
-            
-        req = PredictRequest(**raw)
+        # Old and new target fields are folded into req.target_universities/target_majors
+        req = decode_predict_request(request.get_data())
     except Exception as e:
         return jsonify({"error": f"Invalid payload: {e}"}), 400
 
-    rapor_avg = average([req.s1, req.s2, req.s3, req.s4, req.s5]) or 0.0
-    if req.program == "saintek":
-        core_avg = average([req.math, req.language, req.physics, req.chemistry, req.biology])
-    else:
-        core_avg = average([req.math, req.language, req.economics, req.geography, req.history])
+    # req._grade_vec: grades packed in SCORE_KEYS order, NaN where missing
+    rapor_avg = nan_average(req._grade_vec[RAPOR_COLUMNS]) or 0.0
+    core_avg = nan_average(req._grade_vec[CORE_COLUMNS[req.program]])
     core_avg = core_avg if core_avg is not None else rapor_avg
 
+    # First choices (a blank half of the pair is ""); the remaining ones only matter for /api/recommend
+    target_university = req.target_universities[0] or None if req.target_universities else None
+    target_major = req.target_majors[0] or None if req.target_majors else None
+
     features = {
         "program": req.program,
-        "target_major": req.target_major,
-        "target_university": getattr(req, 'target_university', None),
+        "target_major": target_major,
+        "target_university": target_university,
         "competitiveness": req.competitiveness,
         "rapor_avg": rapor_avg,
         "core_avg": core_avg,
@@ -347,10 +417,6 @@ def predict():
         "accreditation": req.accreditation,
     }
 
-    # Try to find specific university-major combination for better prediction
-    target_university = getattr(req, 'target_university', None)
-    target_major = req.target_major
-    
     if llm and llm.client:
         # For LLM scoring, try to find the specific university-major match
         majors_kb = _load_kb_majors(llm)
@@ -363,7 +429,7 @@ def predict():
             result = llm.score(features, f"{matched_card.get('university', '')} - {matched_card.get('major', '')}")
         else:
             # Fallback to major-only scoring
-            result = llm.score(features, req.target_major or "Unknown")
+            result = llm.score(features, target_major or "Unknown")
             
         prob = float(result.get("probability", 0.0))
         label = decision_label(prob)
@@ -391,7 +457,13 @@ def predict():
     label = decision_label(prob)
     details = {**features, "probability": prob, "label": label}
     tips = recommendations(prob, {**features, "competitiveness_penalty": {"very":5,"high":3,"mid":1,"low":0}[req.competitiveness]})
-    resp = PredictResponse(probability=prob, label=label, details=details, tips=tips)
+    # Typed by construction: skip validation; only debug runs re-check it, production never does
+    resp = PredictResponse.model_construct(
+        probability=prob, label=label, details=PredictDetails.model_construct(**details), tips=tips
+    )
+    if app.debug:
+        PredictResponse.model_validate(resp.model_dump())
+    # Through app.json like every other endpoint (sorted keys)
     return jsonify(resp.model_dump())
 
 # -------------------------------------------------------
@@ -404,38 +476,23 @@ def recommend():
     Query:   pref_n, alt_n, per_uni (default 10,10,2)
     """
     try:
-        raw = request.get_json(force=True, silent=False)
-        
-        # Handle university-major pairs
-        target_universities = []
-        target_majors = []
-        
-        if isinstance(raw.get("target_universities"), list):
-            target_universities = [str(x).strip() for x in raw.get("target_universities") if str(x).strip()]
-        if isinstance(raw.get("target_majors"), list):
-            target_majors = [str(x).strip() for x in raw.get("target_majors") if str(x).strip()]
-            
-        # Legacy support
-        if not raw.get("target_major") and target_majors:
-            raw["target_major"] = target_majors[0]
-        if not raw.get("target_university") and target_universities:
-            raw["target_university"] = target_universities[0]
-            
-        req = PredictRequest(**raw)
+        req = decode_predict_request(request.get_data())
     except Exception as e:
         return jsonify({"error": f"Invalid payload: {e}"}), 400
 
-    rapor_avg = average([req.s1, req.s2, req.s3, req.s4, req.s5]) or 0.0
-    if req.program == "saintek":
-        core_avg = average([req.math, req.language, req.physics, req.chemistry, req.biology])
-    else:
-        core_avg = average([req.math, req.language, req.economics, req.geography, req.history])
+    # req._grade_vec: grades packed in SCORE_KEYS order, NaN where missing
+    rapor_avg = nan_average(req._grade_vec[RAPOR_COLUMNS]) or 0.0
+    core_avg = nan_average(req._grade_vec[CORE_COLUMNS[req.program]])
     core_avg = core_avg if core_avg is not None else rapor_avg
 
+    # University-major choices, paired by position
+    target_universities = req.target_universities
+    target_majors = req.target_majors
+
     feats = {
         "program": req.program,
-        "target_major": req.target_major,
-        "target_university": getattr(req, 'target_university', None),
+        "target_major": target_majors[0] or None if target_majors else None,
+        "target_university": target_universities[0] or None if target_universities else None,
         "competitiveness": req.competitiveness,
         "rapor_avg": rapor_avg,
         "core_avg": core_avg,
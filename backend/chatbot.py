@@ -1,436 +1,1050 @@
 # backend/chatbot.py
+import functools
+import heapq
 import json
+import mmap
+import os
 import re
+import sys
+from types import MappingProxyType
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+import numpy as np
 import pandas as pd
 import pathlib
 
-@dataclass
+try:
+    import ahocorasick  # pip install pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson  # pip install orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow  # noqa: F401  (enables Arrow-backed DataFrame dtypes)
+    import pyarrow.compute as pc
+except ImportError:
+    pyarrow = pc = None
+
+from kb_loader import load_kb_table, table_to_kb
+
+# Max distinct messages memoized per chatbot for the text extractors
+TEXT_CACHE_SIZE = 1024
+
+# KB files larger than this are parsed straight from a memory map
+KB_MMAP_THRESHOLD = 50 * 1024 * 1024
+
+# Cheap precheck: text without any digit cannot contain a grade
+_DIGIT_RE = re.compile(r'\d')
+
+# Columns of the student Excel sheet that are actually loaded
+STUDENT_GRADE_COLUMNS = (
+    'Pendidikan Agama dan Budi Pekerti', 'Pendidikan Pancasila dan Kewarganegaraan (PPKn)',
+    'Bahasa Indonesia', 'Bahasa Inggris', 'Matematika Wajib', 'Seni Budaya',
+    'Pendidikan Jasmani, Olahraga, dan Kesehatan (PJOK)', 'Prakarya/Kewirausahaan',
+    'Matematika Peminatan', 'Fisika', 'Kimia', 'Biologi', 'Geografi', 'Sejarah Peminatan',
+    'Sosiologi', 'Ekonomi', 'Bahasa dan Sastra Indonesia', 'Bahasa dan Sastra Inggris',
+    'Bahasa Asing Lain', 'Antropologi',
+)
+STUDENT_LABEL_COLUMNS = ('SMA Background', 'Jurusan di Terima', 'Kampus di Terima', 'Kategori Jurusan')
+_STUDENT_COLUMNS = frozenset(STUDENT_GRADE_COLUMNS + STUDENT_LABEL_COLUMNS)
+
+# Program ids used by the precomputed KB arrays
+PROGRAM_IDS = {'saintek': 0, 'soshum': 1}
+
+# Subject-bonus categories, matched in this order against the major name;
+# majors matching none get id len(BONUS_CATEGORIES)
+BONUS_CATEGORIES = (
+    ('teknik', 'informatika'),
+    ('kedokteran', 'farmasi'),
+    ('ekonomi', 'manajemen'),
+    ('hukum',),
+)
+
+# Subjects counted when guessing the program from a set of grades
+SAINTEK_GRADE_SUBJECTS = ('matematika', 'fisika', 'kimia', 'biologi')
+SOSHUM_GRADE_SUBJECTS = ('ekonomi', 'geografi', 'sejarah', 'sosiologi')
+
+SAINTEK_MAJOR_KEYWORDS = (
+    'teknik', 'informatika', 'kedokteran', 'farmasi', 'biologi',
+    'kimia', 'fisika', 'matematika', 'arsitektur', 'gizi',
+    'kesehatan', 'kebidanan', 'fisioterapi', 'sistem informasi',
+    'ilmu komputer',
+)
+
+_SAINTEK_MAJOR_RE = re.compile('|'.join(map(re.escape, SAINTEK_MAJOR_KEYWORDS)))
+
+@functools.lru_cache(maxsize=4096)
+def _prog_from_major(major_name: str) -> str:
+    """Program (saintek/soshum) for a major name; majors repeat, so memoized"""
+    if _SAINTEK_MAJOR_RE.search(major_name.lower()):
+        return 'saintek'
+    return 'soshum'
+
+# Subjects that earn a line of advice in the guidance when graded >= STRONG_SUBJECT_GRADE
+STRONG_SUBJECTS = ('matematika', 'fisika', 'biologi', 'bahasa_indonesia')
+STRONG_SUBJECT_GRADE = 85
+_STRONG_SUBJECT_ADVICE = (
+    "• Nilai matematika Anda bagus - cocok untuk jurusan Saintek/Ekonomi",
+    "• Nilai fisika tinggi - pertimbangkan jurusan Teknik",
+    "• Nilai biologi excellent - Kedokteran/Farmasi bisa jadi pilihan",
+    "• Kemampuan bahasa baik - cocok untuk jurusan Soshum",
+)
+
+# Grade predicates per category: (subject, minimum grade) for bit 0 and bit 1
+BONUS_RULES = (
+    (('matematika', 85), ('fisika', 80)),
+    (('biologi', 85), ('kimia', 80)),
+    (('matematika', 80), ('ekonomi', 85)),
+    (('bahasa_indonesia', 85), None),
+    (None, None),
+)
+
+# BONUS_TABLE[category, bits] -> subject bonus, already capped at 0.2
+BONUS_TABLE = np.array([
+    [0.0, 0.15, 0.1, 0.2],
+    [0.0, 0.15, 0.1, 0.2],
+    [0.0, 0.1, 0.15, 0.2],
+    [0.0, 0.15, 0.0, 0.15],
+    [0.0, 0.0, 0.0, 0.0],
+])
+
+def _bonus_category(major_lower: str) -> int:
+    """Return the subject-bonus category id for a lowercased major name"""
+    for category_id, keywords in enumerate(BONUS_CATEGORIES):
+        if any(keyword in major_lower for keyword in keywords):
+            return category_id
+    return len(BONUS_CATEGORIES)
+
+def _round3(values: np.ndarray) -> np.ndarray:
+    """np.round(values, 3), matching Python's round() on near-half cases"""
+    rounded = np.round(values, 3)
+    flat_values, flat_rounded = values.reshape(-1), rounded.reshape(-1)
+    for i in np.flatnonzero(np.abs(flat_values * 1000 % 1 - 0.5) < 1e-6):
+        flat_rounded[i] = round(float(flat_values[i]), 3)
+    return rounded
+
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, descending; ties keep index order"""
+    if scores.size > k:
+        kth = np.partition(scores, scores.size - k)[scores.size - k]
+        candidates = np.flatnonzero(scores >= kth)
+    else:
+        candidates = np.arange(scores.size)
+    order = np.argsort(-scores[candidates], kind='stable')
+    return candidates[order][:k]
+
+
+class KeywordAutomaton:
+    """Multi-keyword substring matcher built once over a fixed vocabulary.
+
+    Uses an Aho-Corasick automaton (pyahocorasick) when available so one pass
+    over the text finds every keyword. Otherwise one lookahead regex scan finds
+    the positions where some keyword starts, and only those positions are
+    checked against the vocabulary.
+    """
+
+    def __init__(self, items):
+        self._items = tuple(items)  # (keyword, payload) pairs
+        self._automaton = None
+        self._start_re = None
+        if not self._items:
+            return
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword, payload in self._items:
+                self._automaton.add_word(keyword, (keyword, payload))
+            self._automaton.make_automaton()
+        else:
+            self._start_re = re.compile('(?=' + '|'.join(re.escape(keyword) for keyword, _ in self._items) + ')')
+
+    def iter(self, text: str):
+        """Yield (start, keyword, payload) for every keyword occurrence in text"""
+        if not text or not self._items:
+            return
+        if self._automaton is not None:
+            for end, (keyword, payload) in self._automaton.iter(text):
+                yield end - len(keyword) + 1, keyword, payload
+            return
+        for match in self._start_re.finditer(text):
+            start = match.start()
+            for keyword, payload in self._items:
+                if text.startswith(keyword, start):
+                    yield start, keyword, payload
+
+# Pattern untuk menangkap nilai dengan berbagai format ({value} = nilai)
+_GRADE_PATTERNS = (
+    (r'matematika[:\s]*(?:nilai\s*)?{value}', 'matematika'),
+    (r'fisika[:\s]*(?:nilai\s*)?{value}', 'fisika'),
+    (r'kimia[:\s]*(?:nilai\s*)?{value}', 'kimia'),
+    (r'biologi[:\s]*(?:nilai\s*)?{value}', 'biologi'),
+    (r'ekonomi[:\s]*(?:nilai\s*)?{value}', 'ekonomi'),
+    (r'geografi[:\s]*(?:nilai\s*)?{value}', 'geografi'),
+    (r'sejarah[:\s]*(?:nilai\s*)?{value}', 'sejarah'),
+    (r'sosiologi[:\s]*(?:nilai\s*)?{value}', 'sosiologi'),
+    (r'bahasa\s*indonesia[:\s]*(?:nilai\s*)?{value}', 'bahasa_indonesia'),
+    (r'bahasa\s*inggris[:\s]*(?:nilai\s*)?{value}', 'bahasa_inggris'),
+    (r'(?:rata[:\s-]*rata|rapor)[:\s]*(?:nilai\s*)?{value}', 'rata_rata'),
+    (r'(?:nilai\s+)?{value}[:\s]*matematika', 'matematika'),
+    (r'(?:nilai\s+)?{value}[:\s]*fisika', 'fisika'),
+    (r'(?:nilai\s+)?{value}[:\s]*kimia', 'kimia'),
+    (r'(?:nilai\s+)?{value}[:\s]*biologi', 'biologi'),
+)
+
+def _compile_grade_patterns() -> Tuple[re.Pattern, Dict[str, str]]:
+    """Union the grade patterns into one regex with a named group per pattern"""
+    alternatives = []
+    group_to_subject = {}
+    for i, (pattern, subject) in enumerate(_GRADE_PATTERNS):
+        group = f"{subject}__{i}"
+        alternatives.append(pattern.replace('{value}', rf'(?P<{group}>\d+(?:[.,]\d+)?)'))
+        group_to_subject[group] = subject
+    
+    return re.compile('|'.join(alternatives), re.IGNORECASE), group_to_subject
+
+_GRADE_RE, _GRADE_GROUP_TO_SUBJECT = _compile_grade_patterns()
+
+# Subjects in order of first appearance in _GRADE_PATTERNS, the order replies list them in
+_GRADE_SUBJECT_RANK = {subject: i for i, subject in enumerate(dict.fromkeys(s for _, s in _GRADE_PATTERNS))}
+
+# Enhanced major-subject mappings
+_MAJOR_MAPPINGS = {
+    'saintek': {
+        'teknik': {'matematika': 'high', 'fisika': 'high', 'bahasa_inggris': 'medium'},
+        'informatika': {'matematika': 'high', 'fisika': 'medium', 'bahasa_inggris': 'high'},
+        'kedokteran': {'biologi': 'high', 'kimia': 'high', 'fisika': 'medium', 'matematika': 'medium'},
+        'farmasi': {'kimia': 'high', 'biologi': 'high', 'matematika': 'medium'},
+        'arsitektur': {'matematika': 'high', 'fisika': 'high', 'bahasa_inggris': 'medium'},
+        'biologi': {'biologi': 'high', 'kimia': 'medium', 'matematika': 'medium'},
+        'kimia': {'kimia': 'high', 'matematika': 'high', 'fisika': 'medium'},
+        'fisika': {'fisika': 'high', 'matematika': 'high'},
+        'matematika': {'matematika': 'high', 'fisika': 'medium'},
+        'default': {'matematika': 'high', 'fisika': 'medium', 'kimia': 'medium', 'biologi': 'medium', 'bahasa_indonesia': 'basic', 'bahasa_inggris': 'basic'}
+    },
+    'soshum': {
+        'ekonomi': {'matematika': 'high', 'ekonomi': 'high', 'bahasa_inggris': 'medium'},
+        'hukum': {'bahasa_indonesia': 'high', 'sejarah': 'medium', 'sosiologi': 'medium'},
+        'komunikasi': {'bahasa_indonesia': 'high', 'bahasa_inggris': 'high', 'sosiologi': 'medium'},
+        'psikologi': {'matematika': 'medium', 'sosiologi': 'high', 'bahasa_indonesia': 'medium'},
+        'administrasi': {'ekonomi': 'high', 'sosiologi': 'medium', 'bahasa_indonesia': 'medium'},
+        'hubungan internasional': {'bahasa_inggris': 'high', 'sejarah': 'high', 'geografi': 'medium'},
+        'manajemen': {'matematika': 'high', 'ekonomi': 'high', 'bahasa_inggris': 'medium'},
+        'akuntansi': {'matematika': 'high', 'ekonomi': 'high'},
+        'default': {'ekonomi': 'high', 'sejarah': 'medium', 'geografi': 'medium', 'sosiologi': 'medium', 'matematika': 'medium', 'bahasa_indonesia': 'medium', 'bahasa_inggris': 'basic'}
+    }
+}
+
+# (category, split keywords, subjects) per program, in mapping order
+_MAJOR_CATEGORY_KEYWORDS = {
+    program: tuple(
+        (category, tuple(category.split()), subjects)
+        for category, subjects in mapping.items() if category != 'default'
+    )
+    for program, mapping in _MAJOR_MAPPINGS.items()
+}
+
+# Topic-priority tags, tested in this order against the lowercased major name
+_TOPIC_CATEGORY_KEYWORDS = (
+    ('teknik', frozenset(('teknik', 'informatika'))),
+    ('kedokteran', frozenset(('kedokteran',))),
+    ('ekonomi', frozenset(('ekonomi',))),
+)
+
+# Priority topics per (subject, tag); subjects without a match get their first
+# _TOPIC_DEFAULT_COUNT topics (6 unless listed)
+_TOPIC_PRIORITY = {
+    ('matematika', 'teknik'): ('Fungsi, Komposisi, dan Invers', 'Limit Fungsi', 'Turunan dan Aplikasinya',
+                               'Integral dan Aplikasinya', 'Trigonometri', 'Vektor'),
+    ('matematika', 'ekonomi'): ('Sistem Persamaan Linear', 'Program Linear', 'Statistika dan Peluang',
+                                'Barisan dan Deret', 'Matematika Keuangan'),
+    ('fisika', 'teknik'): ('Kinematika Gerak', 'Dinamika Partikel', 'Usaha dan Energi',
+                           'Listrik Statis', 'Listrik Dinamis', 'Kemagnetan'),
+    ('biologi', 'kedokteran'): ('Sel sebagai Unit Kehidupan', 'Sistem Organ pada Manusia',
+                                'Genetika', 'Biomolekul', 'Reproduksi dan Perkembangan'),
+}
+_TOPIC_DEFAULT_COUNT = {'matematika': 8}
+
+@functools.lru_cache(maxsize=256)
+def _topic_tags(major_lower: str) -> Tuple[str, ...]:
+    """Every topic-priority tag whose keywords occur in the major name, in priority order"""
+    return tuple(
+        tag for tag, keywords in _TOPIC_CATEGORY_KEYWORDS
+        if any(keyword in major_lower for keyword in keywords)
+    )
+
+# Fallback for universities not covered by the alias table
+_UNI_REGEX = re.compile(r'(?:universitas|institut|politeknik|sekolah\s+tinggi)\s+[a-zA-Z\s]+', re.IGNORECASE)
+
+# Intents whose replies go through the semantic cache (namespaced by extracted major/university)
+SEMANTIC_CACHE_INTENTS = frozenset(('major_preparation', 'major_info'))
+
+# Common major keywords with more variations
+MAJOR_KEYWORDS = (
+    'teknik informatika', 'informatika', 'kedokteran', 'farmasi', 'hukum',
+    'ekonomi', 'manajemen', 'akuntansi', 'psikologi', 'komunikasi', 'teknik sipil',
+    'teknik mesin', 'teknik elektro', 'arsitektur', 'biologi', 'kimia', 'fisika',
+    'matematika', 'sastra inggris', 'hubungan internasional', 'administrasi',
+    'keperawatan', 'teknik industri', 'sistem informasi', 'ilmu komputer',
+    'desain grafis', 'broadcasting', 'jurnalistik', 'perpustakaan', 'gizi',
+    'kesehatan masyarakat', 'kebidanan', 'fisioterapi',
+)
+
+# Longer first, to match more specific terms first
+_MAJOR_KEYWORDS_SORTED = tuple(sorted(MAJOR_KEYWORDS, key=len, reverse=True))
+
+# Keywords for different intents
+INTENT_KEYWORDS = {
+    'major_target': frozenset(('ingin', 'mau', 'pengen', 'target', 'cita-cita', 'impian', 'masuk')),
+    'major_info': frozenset(('cocok', 'sesuai', 'rekomendasi', 'saran', 'jurusan apa')),
+    'study': frozenset(('belajar', 'tips', 'cara', 'strategi', 'meningkatkan', 'persiapan', 'utbk')),
+    'info': frozenset(('info', 'informasi', 'passing grade', 'persyaratan', 'syarat')),
+}
+
+# Topik bahasa sama untuk saintek dan soshum, dipakai bersama
+_BAHASA_INDONESIA_TOPICS = (
+    "Teks Laporan Hasil Observasi",
+    "Teks Eksposisi",
+    "Teks Anekdot",
+    "Teks Hikayat",
+    "Teks Negosiasi",
+    "Teks Debat",
+    "Teks Biografi",
+    "Puisi",
+    "Hikayat",
+    "Novel",
+    "Drama",
+    "Kritik dan Esai",
+    "Resensi",
+)
+
+_BAHASA_INGGRIS_TOPICS = (
+    "Expression and Greeting",
+    "Congratulation and Compliment",
+    "Asking and Giving Opinion",
+    "Suggestion and Offer",
+    "Announcement",
+    "Recount Text",
+    "Narrative Text",
+    "Descriptive Text",
+    "News Item",
+    "Analytical Exposition",
+    "Hortatory Exposition",
+    "Explanation Text",
+    "Discussion Text",
+    "Review Text",
+)
+
+@dataclass(slots=True, frozen=True)
 class SubjectTopic:
     subject: str
-    topics: List[str]
+    topics: Tuple[str, ...]
     difficulty: str  # 'basic', 'intermediate', 'advanced'
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ChatbotResponse:
     message: str
-    recommendations: List[Dict]
-    study_plan: List[SubjectTopic]
+    recommendations: Tuple[Dict, ...]
+    study_plan: Tuple[SubjectTopic, ...]
     confidence: float
 
+def _response_to_json(response: ChatbotResponse) -> Dict:
+    """ChatbotResponse as plain JSON-serializable data (for the semantic cache)"""
+    return asdict(response)
+
+def _response_from_json(data: Dict) -> ChatbotResponse:
+    """Rebuild a ChatbotResponse from _response_to_json output"""
+    return ChatbotResponse(
+        message=data['message'],
+        recommendations=tuple(data['recommendations']),
+        study_plan=tuple(
+            SubjectTopic(plan['subject'], tuple(plan['topics']), plan['difficulty'])
+            for plan in data['study_plan']
+        ),
+        confidence=data['confidence'],
+    )
+
+# Responses that don't depend on the message, built once
+_GENERAL_RESPONSE = ChatbotResponse(
+    message="""👋 **Halo! Saya chatbot konsultasi pendidikan**
+
+Saya bisa membantu Anda dengan:
+
+🎯 **Rekomendasi Jurusan** berdasarkan nilai rapor
+Contoh: "Nilai matematika 85, fisika 80, kimia 78, rata-rata 82"
+
+📚 **Rencana Belajar** untuk jurusan target
+Contoh: "Saya ingin masuk Teknik Informatika"
+
+💡 **Tips Belajar** untuk persiapan UTBK
+Contoh: "Bagaimana cara belajar matematika yang efektif?"
+
+📊 **Informasi Jurusan** dan passing grade
+Contoh: "Info tentang jurusan Kedokteran"
+
+Silakan tanyakan apa yang ingin Anda ketahui! 😊""",
+    recommendations=(),
+    study_plan=(),
+    confidence=0.6
+)
+
+_STUDY_TIPS_RESPONSE = ChatbotResponse(
+    message="""📚 **Tips Belajar Efektif untuk UTBK**
+
+🎯 **Strategi Umum**:
+• Buat jadwal belajar harian yang konsisten
+• Gunakan teknik Pomodoro (25 menit fokus, 5 menit istirahat)
+• Belajar dari buku referensi dan soal-soal UTBK terbaru
+• Bergabung dengan grup belajar atau komunitas online
+
+📖 **Per Mata Pelajaran**:
+• **Matematika**: Pahami konsep dasar, latihan soal bertahap dari mudah ke sulit
+• **Fisika**: Kuasai rumus, pahami konsep, banyak latihan soal cerita
+• **Kimia**: Hafal tabel periodik, pahami reaksi kimia, latihan stoikiometri
+• **Biologi**: Buat mind map, hafal istilah penting, pahami proses biologis
+
+⏰ **Manajemen Waktu**:
+• Alokasikan waktu lebih banyak untuk mata pelajaran yang lemah
+• Sisakan waktu untuk review dan latihan soal campuran
+• Jangan lupa istirahat dan menjaga kesehatan
+
+🎯 **Target Harian**: Minimal 3-4 jam belajar efektif per hari""",
+    recommendations=(),
+    study_plan=(),
+    confidence=0.7
+)
+
+_NO_GRADES_RESPONSE = ChatbotResponse(
+    message="""📊 **Untuk memberikan rekomendasi jurusan yang akurat, saya perlu informasi nilai rapor Anda.**
+
+Contoh format yang bisa Anda gunakan:
+• "Nilai matematika 85, fisika 80, kimia 78, rata-rata 82"
+• "Rapor saya: matematika 90, biologi 88, kimia 85"
+• "Nilai rata-rata rapor saya 85, matematika 88, fisika 82"
+
+Sertakan juga nilai mata pelajaran yang relevan dengan minat Anda! 🎯""",
+    recommendations=(),
+    study_plan=(),
+    confidence=0.3
+)
+
+_NO_TARGET_MAJOR_RESPONSE = ChatbotResponse(
+    message="""🤔 **Untuk memberikan panduan yang tepat, mohon sebutkan jurusan yang Anda targetkan.**
+
+Contoh:
+• "Saya ingin masuk Teknik Informatika"
+• "Target saya Kedokteran di UI"
+• "Mau ke jurusan Ekonomi ITB"
+
+Atau jika masih bingung memilih jurusan, coba ceritakan:
+• Mata pelajaran favorit Anda
+• Bidang yang Anda minati
+• Cita-cita karir Anda""",
+    recommendations=(),
+    study_plan=(),
+    confidence=0.3
+)
+
+_NO_INFO_MAJOR_RESPONSE = ChatbotResponse(
+    message="Jurusan mana yang ingin Anda ketahui informasinya?",
+    recommendations=(),
+    study_plan=(),
+    confidence=0.3
+)
+
+# Tips per major category (see _major_tips_category)
+_MAJOR_TIP_LINES = {
+    'informatika': (
+        "• **Matematika** adalah fondasi utama - kuasai logika, aljabar, dan statistika",
+        "• **Algoritma & Pemrograman** - mulai belajar bahasa pemrograman seperti Python/Java",
+        "• **Logika Berpikir** - latihan soal-soal logika dan problem solving",
+        "• **Bahasa Inggris** - penting untuk membaca dokumentasi teknis",
+        "• **Portofolio** - buat project sederhana untuk menunjukkan kemampuan",
+    ),
+    'kedokteran': (
+        "• **Biologi** - fokus pada anatomi, fisiologi, dan biokimia",
+        "• **Kimia** - kuasai kimia organik dan biokimia",
+        "• **Fisika** - pahami prinsip fisika dalam tubuh manusia",
+        "• **Bahasa Inggris** - untuk membaca jurnal medis internasional",
+        "• **Soft Skills** - empati, komunikasi, dan ketahanan mental",
+    ),
+    'teknik': (
+        "• **Matematika & Fisika** - dasar semua cabang teknik",
+        "• **Problem Solving** - latihan soal-soal aplikatif",
+        "• **Kreativitas** - kemampuan berpikir inovatif",
+        "• **Kerja Tim** - banyak project berbasis kelompok",
+        "• **Update Teknologi** - ikuti perkembangan teknologi terkini",
+    ),
+    'ekonomi': (
+        "• **Matematika** - statistika, kalkulus, dan matematika bisnis",
+        "• **Bahasa Inggris** - komunikasi bisnis internasional",
+        "• **Analisis** - kemampuan berpikir kritis dan analitis",
+        "• **Leadership** - keterampilan kepemimpinan dan manajemen",
+        "• **Current Issues** - ikuti perkembangan ekonomi dan bisnis",
+    ),
+    'hukum': (
+        "• **Bahasa Indonesia** - kemampuan menulis dan berargumentasi",
+        "• **Sejarah** - memahami sejarah hukum dan konstitusi",
+        "• **Logika** - kemampuan berpikir sistematis dan analitis",
+        "• **Public Speaking** - keterampilan berbicara di depan umum",
+        "• **Reading** - banyak membaca kasus hukum dan perundangan",
+    ),
+    'default': (
+        "• **Mata Pelajaran Inti** - fokus pada mapel yang relevan dengan jurusan",
+        "• **Soft Skills** - komunikasi, leadership, dan teamwork",
+        "• **Wawasan Umum** - perbanyak membaca dan update informasi",
+        "• **Pengalaman** - ikuti kegiatan ekstrakurikuler yang relevan",
+        "• **Networking** - bangun relasi dengan senior di bidang yang sama",
+    ),
+}
+# Tip blocks joined once, ready to drop into the preparation template
+_MAJOR_TIPS = {category: "\n".join(lines) for category, lines in _MAJOR_TIP_LINES.items()}
+
+@functools.lru_cache(maxsize=256)
+def _major_tips_category(major_lower: str) -> str:
+    """_MAJOR_TIPS key for a lowercased major name"""
+    if 'informatika' in major_lower or 'komputer' in major_lower:
+        return 'informatika'
+    elif 'kedokteran' in major_lower:
+        return 'kedokteran'
+    elif 'teknik' in major_lower:
+        return 'teknik'
+    elif 'ekonomi' in major_lower or 'manajemen' in major_lower:
+        return 'ekonomi'
+    elif 'hukum' in major_lower:
+        return 'hukum'
+    return 'default'
+
+# Grade analysis reply, joined from these static pieces and the dynamic sections
+_GRADE_TO_MAJOR_HEADER = "📊 **Analisis Nilai Rapor Anda (Rata-rata: {:.1f})**\n\n"
+_GRADE_TO_MAJOR_VERY_LIKELY = "\n\n🎯 **REKOMENDASI JURUSAN:**\n\n🟢 **PELUANG BESAR (>80%)** - Sangat Direkomendasikan:\n"
+_GRADE_TO_MAJOR_LIKELY = "\n\n🟡 **PELUANG SEDANG (60-80%)** - Layak Dipertimbangkan:\n"
+_GRADE_TO_MAJOR_POSSIBLE = "\n\n🟠 **PELUANG KECIL (40-60%)** - Perlu Usaha Ekstra:\n"
+_GRADE_TO_MAJOR_GUIDANCE = "\n\n💡 **PANDUAN PERSONAL:**\n"
+_GRADE_TO_MAJOR_FOOTER = (
+    "\n\n🤔 **Masih bingung memilih?** Ceritakan minat dan cita-cita Anda, "
+    "saya akan membantu mengarahkan pilihan yang tepat!"
+)
+
+# Handler message templates, filled with str.format_map
+_MAJOR_PREPARATION_TEMPLATE = """🎯 **Panduan Persiapan untuk {major_title}**
+{university_line}
+
+📚 **Mata Pelajaran yang Harus Dikuasai:**
+
+{study_plan}
+
+💡 **Tips Khusus untuk {major_title}:**
+{major_tips}
+
+📊 **Informasi Tambahan:**
+{related_info}
+
+🎯 **Strategi Persiapan:**
+1. **Fokus Utama**: Kuasai mata pelajaran inti dengan baik
+2. **Latihan Rutin**: Kerjakan soal-soal UTBK 3-5 tahun terakhir
+3. **Target Nilai**: Usahakan nilai rapor minimal 85 untuk mata pelajaran inti
+4. **Pengalaman**: Ikuti olimpiade/kompetisi yang relevan jika memungkinkan
+5. **Backup Plan**: Siapkan 2-3 pilihan jurusan alternatif
+
+💪 **Jangan lupa untuk konsisten belajar dan tetap semangat!**"""
+
+_MAJOR_INFO_ITEM_TEMPLATE = """**{i}. {university} - {major}**
+   • Passing Grade: {passing_grade}
+   • Rata-rata Rapor: {required_rapor}
+   • Tingkat Persaingan: {competitiveness}
+   • Daya Tampung: {capacity} orang
+   • Acceptance Rate: {acceptance_rate}%
+
+"""
+
 class EducationChatbot:
-    def __init__(self, majors_kb_path: str, student_data_path: Optional[str] = None):
+    # University name aliases and abbreviations
+    UNIVERSITY_ALIASES: Dict[str, str] = {
+        # Universitas Negeri
+        'ui': 'Universitas Indonesia',
+        'universitas indonesia': 'Universitas Indonesia',
+        'itb': 'Institut Teknologi Bandung',
+        'institut teknologi bandung': 'Institut Teknologi Bandung',
+        'ugm': 'Universitas Gadjah Mada',
+        'universitas gadjah mada': 'Universitas Gadjah Mada',
+        'its': 'Institut Teknologi Sepuluh Nopember',
+        'institut teknologi sepuluh nopember': 'Institut Teknologi Sepuluh Nopember',
+        'ipb': 'Institut Pertanian Bogor',
+        'institut pertanian bogor': 'Institut Pertanian Bogor',
+        'undip': 'Universitas Diponegoro',
+        'universitas diponegoro': 'Universitas Diponegoro',
+        'unair': 'Universitas Airlangga',
+        'universitas airlangga': 'Universitas Airlangga',
+        'unsri': 'Universitas Sriwijaya',
+        'universitas sriwijaya': 'Universitas Sriwijaya',
+        'unhas': 'Universitas Hasanuddin',
+        'universitas hasanuddin': 'Universitas Hasanuddin',
+        'unpad': 'Universitas Padjadjaran',
+        'universitas padjadjaran': 'Universitas Padjadjaran',
+        'uns': 'Universitas Sebelas Maret',
+        'universitas sebelas maret': 'Universitas Sebelas Maret',
+        'upi': 'Universitas Pendidikan Indonesia',
+        'universitas pendidikan indonesia': 'Universitas Pendidikan Indonesia',
+        'unesa': 'Universitas Negeri Surabaya',
+        'universitas negeri surabaya': 'Universitas Negeri Surabaya',
+        'uny': 'Universitas Negeri Yogyakarta',
+        'universitas negeri yogyakarta': 'Universitas Negeri Yogyakarta',
+        'unm': 'Universitas Negeri Makassar',
+        'universitas negeri makassar': 'Universitas Negeri Makassar',
+        'unp': 'Universitas Negeri Padang',
+        'universitas negeri padang': 'Universitas Negeri Padang',
+        'um': 'Universitas Negeri Malang',
+        'universitas negeri malang': 'Universitas Negeri Malang',
+        'unej': 'Universitas Jember',
+        'universitas jember': 'Universitas Jember',
+        'unsoed': 'Universitas Jenderal Soedirman',
+        'universitas jenderal soedirman': 'Universitas Jenderal Soedirman',
+        'untirta': 'Universitas Sultan Ageng Tirtayasa',
+        'universitas sultan ageng tirtayasa': 'Universitas Sultan Ageng Tirtayasa',
+        'untan': 'Universitas Tanjungpura',
+        'universitas tanjungpura': 'Universitas Tanjungpura',
+        'unsyiah': 'Universitas Syiah Kuala',
+        'universitas syiah kuala': 'Universitas Syiah Kuala',
+        'unand': 'Universitas Andalas',
+        'universitas andalas': 'Universitas Andalas',
+        'unri': 'Universitas Riau',
+        'universitas riau': 'Universitas Riau',
+        'usu': 'Universitas Sumatera Utara',
+        'universitas sumatera utara': 'Universitas Sumatera Utara',
+        
+        # Institut dan Politeknik
+        'itn': 'Institut Teknologi Nasional',
+        'itenas': 'Institut Teknologi Nasional',
+        'itera': 'Institut Teknologi Sumatera',
+        'institut teknologi sumatera': 'Institut Teknologi Sumatera',
+        'pens': 'Politeknik Elektronika Negeri Surabaya',
+        'politeknik elektronika negeri surabaya': 'Politeknik Elektronika Negeri Surabaya',
+        'pnj': 'Politeknik Negeri Jakarta',
+        'politeknik negeri jakarta': 'Politeknik Negeri Jakarta',
+        
+        # Universitas Swasta Terkenal
+        'uph': 'Universitas Pelita Harapan',
+        'universitas pelita harapan': 'Universitas Pelita Harapan',
+        'binus': 'Bina Nusantara University',
+        'bina nusantara': 'Bina Nusantara University',
+        'trisakti': 'Universitas Trisakti',
+        'universitas trisakti': 'Universitas Trisakti',
+        'atmajaya': 'Universitas Katolik Indonesia Atma Jaya',
+        'unika atma jaya': 'Universitas Katolik Indonesia Atma Jaya',
+        'tarumanagara': 'Universitas Tarumanagara',
+        'universitas tarumanagara': 'Universitas Tarumanagara',
+        'untar': 'Universitas Tarumanagara',
+        'paramadina': 'Universitas Paramadina',
+        'universitas paramadina': 'Universitas Paramadina',
+    }
+    
+    # Subject-topic mapping based on Indonesian SMA curriculum
+    CURRICULUM_MAP: Dict[str, Dict[str, Tuple[str, ...]]] = {
+        "saintek": {
+            "matematika": (
+                "Fungsi, Komposisi, dan Invers",
+                "Persamaan dan Pertidaksamaan",
+                "Sistem Persamaan Linear",
+                "Matriks dan Determinan",
+                "Program Linear",
+                "Barisan dan Deret",
+                "Limit Fungsi",
+                "Turunan dan Aplikasinya",
+                "Integral dan Aplikasinya",
+                "Trigonometri",
+                "Dimensi Tiga",
+                "Vektor",
+                "Statistika dan Peluang"
+            ),
+            "fisika": (
+                "Besaran dan Satuan",
+                "Kinematika Gerak",
+                "Dinamika Partikel",
+                "Usaha dan Energi",
+                "Momentum dan Impuls",
+                "Rotasi dan Kesetimbangan Benda Tegar",
+                "Elastisitas dan Hukum Hooke",
+                "Fluida Statis dan Dinamis",
+                "Suhu dan Kalor",
+                "Termodinamika",
+                "Gelombang Mekanik",
+                "Bunyi",
+                "Cahaya dan Optik",
+                "Listrik Statis",
+                "Listrik Dinamis",
+                "Kemagnetan",
+                "Induksi Elektromagnetik",
+                "Arus Bolak-balik",
+                "Radiasi Benda Hitam",
+                "Teori Kuantum",
+                "Fisika Atom dan Inti"
+            ),
+            "kimia": (
+                "Struktur Atom dan Tabel Periodik",
+                "Ikatan Kimia",
+                "Bentuk Molekul",
+                "Stoikiometri",
+                "Larutan",
+                "Reaksi Redoks",
+                "Termokimia",
+                "Laju Reaksi",
+                "Kesetimbangan Kimia",
+                "Kesetimbangan Ion dan pH",
+                "Larutan Penyangga",
+                "Hidrolisis Garam",
+                "Kelarutan dan Hasil Kali Kelarutan",
+                "Elektrokimia",
+                "Kimia Unsur",
+                "Senyawa Karbon",
+                "Benzena dan Turunannya",
+                "Makromolekul"
+            ),
+            "biologi": (
+                "Keanekaragaman Hayati",
+                "Virus",
+                "Archaebacteria dan Eubacteria",
+                "Protista",
+                "Fungi",
+                "Plantae",
+                "Animalia",
+                "Ekosistem",
+                "Sel sebagai Unit Kehidupan",
+                "Biomolekul",
+                "Katabolisme dan Anabolisme",
+                "Genetika",
+                "Mutasi",
+                "Evolusi",
+                "Bioteknologi",
+                "Sistem Organ pada Manusia",
+                "Reproduksi dan Perkembangan"
+            ),
+            "bahasa_indonesia": _BAHASA_INDONESIA_TOPICS,
+            "bahasa_inggris": _BAHASA_INGGRIS_TOPICS
+        },
+        "soshum": {
+            "matematika": (
+                "Bilangan Real",
+                "Persamaan dan Pertidaksamaan Linear",
+                "Sistem Persamaan Linear Dua Variabel",
+                "Fungsi Kuadrat",
+                "Matematika Keuangan",
+                "Barisan dan Deret Aritmatika",
+                "Barisan dan Deret Geometri",
+                "Statistika Deskriptif",
+                "Peluang",
+                "Kombinatorika"
+            ),
+            "ekonomi": (
+                "Ilmu Ekonomi dan Masalah Ekonomi",
+                "Sistem Ekonomi",
+                "Kebutuhan dan Alat Pemuas Kebutuhan",
+                "Perilaku Konsumen dan Produsen",
+                "Pasar dan Terbentuknya Harga",
+                "Elastisitas dan Penerapannya",
+                "Konsep Produksi",
+                "Biaya Produksi",
+                "Pendapatan Nasional",
+                "Pertumbuhan dan Pembangunan Ekonomi",
+                "Ketenagakerjaan",
+                "APBN dan APBD",
+                "Perpajakan",
+                "Uang dan Lembaga Keuangan",
+                "Kebijakan Moneter dan Fiskal",
+                "Perdagangan Internasional",
+                "Neraca Pembayaran",
+                "Kerjasama Ekonomi Internasional",
+                "Akuntansi sebagai Sistem Informasi",
+                "Persamaan Dasar Akuntansi",
+                "Siklus Akuntansi",
+                "Akuntansi Perusahaan Dagang",
+                "Manajemen dan Badan Usaha",
+                "Kewirausahaan"
+            ),
+            "geografi": (
+                "Pengetahuan Dasar Geografi",
+                "Penelitian Geografi",
+                "Langkah Penelitian Geografi",
+                "Dinamika Planet Bumi",
+                "Hubungan Matahari, Bumi, dan Bulan",
+                "Lapisan Bumi",
+                "Lithosfer dan Pedosfer",
+                "Atmosfer dan Hidrosfer",
+                "Biosfer",
+                "Antroposfer",
+                "Sumber Daya Alam",
+                "Ketahanan Pangan, Industri, dan Energi",
+                "Kearifan dalam Pemanfaatan SDA",
+                "Mitigasi dan Adaptasi Bencana Alam",
+                "Dinamika Kependudukan",
+                "Keragaman Budaya Indonesia",
+                "Ketahanan Pangan Nasional",
+                "Industri dan Pertanian",
+                "Transportasi dan Tata Guna Lahan",
+                "Interaksi Keruangan Desa dan Kota"
+            ),
+            "sejarah": (
+                "Konsep Berpikir Sejarah",
+                "Penelitian Sejarah",
+                "Peradaban Awal Dunia",
+                "Peradaban Awal Masyarakat Indonesia",
+                "Perkembangan Negara-negara Tradisional",
+                "Indonesia Zaman Hindu-Buddha",
+                "Perkembangan Islam di Dunia",
+                "Perkembangan Islam di Indonesia",
+                "Revolusi Dunia dan Pengaruhnya",
+                "Kolonialisme dan Imperialisme",
+                "Pergerakan Nasional Indonesia",
+                "Proklamasi dan Perkembangan Negara",
+                "Dinasti Abbasiyah",
+                "Perang Dunia dan Dampaknya",
+                "Proklamasi Kemerdekaan RI",
+                "Perkembangan Negara Kebangsaan",
+                "Sistem dan Struktur Politik-Ekonomi Indonesia",
+                "Kehidupan Politik dan Ekonomi Bangsa Indonesia",
+                "Peran Bangsa Indonesia dalam Perdamaian Dunia"
+            ),
+            "sosiologi": (
+                "Fungsi Sosiologi untuk Mengenali Gejala Sosial",
+                "Individu, Kelompok, dan Hubungan Sosial",
+                "Ragam Gejala Sosial dalam Masyarakat",
+                "Rancangan Penelitian Sosial",
+                "Pembentukan Kelompok Sosial",
+                "Permasalahan Sosial dalam Masyarakat",
+                "Perbedaan, Kesetaraan, dan Harmoni Sosial",
+                "Konflik dan Integrasi dalam Kehidupan Sosial",
+                "Kearifan Lokal dan Pemberdayaan Komunitas",
+                "Ketimpangan Sosial sebagai Dampak Perubahan",
+                "Globalisasi dan Perubahan Komunitas Lokal",
+                "Penelitian Sosial dan Metode Penelitian"
+            ),
+            "bahasa_indonesia": _BAHASA_INDONESIA_TOPICS,
+            "bahasa_inggris": _BAHASA_INGGRIS_TOPICS
+        }
+    }
+    
+    def __init__(self, majors_kb_path: str, student_data_path: Optional[str] = None, semantic_cache=None):
+        self._kb_table = None  # Arrow view of the KB, set by _load_majors_kb when pyarrow is installed
         self.majors_kb = self._load_majors_kb(majors_kb_path)
         self.student_data = self._load_student_data(student_data_path) if student_data_path else None
-        self.curriculum_map = self._init_curriculum_map()
-        self.university_aliases = self._init_university_aliases()
+        self.curriculum_map = self.CURRICULUM_MAP
+        self.university_aliases = self.UNIVERSITY_ALIASES
+        self._kb_prep = self._prepare_kb()
+        self._kb_arr = self._build_kb_arrays()
+        self._major_keyword_index = self._build_major_keyword_index()
+        self._aliases_sorted = tuple(sorted(self.university_aliases.items(), key=lambda kv: -len(kv[0])))
+        self._university_needles = self._build_university_needles()
+        self._alias_re = re.compile(
+            r'\b(' + '|'.join(re.escape(alias) for alias, _ in self._aliases_sorted) + r')\b', re.IGNORECASE
+        )
+        self._intent_automaton = self._init_intent_automaton()
+        self._major_automaton = KeywordAutomaton(
+            (keyword, (len(keyword), -i, keyword)) for i, keyword in enumerate(MAJOR_KEYWORDS)
+        ) if ahocorasick is not None else None
         
-    def _init_university_aliases(self) -> Dict[str, str]:
-        """Initialize university name aliases and abbreviations"""
-        return {
-            # Universitas Negeri
-            'ui': 'Universitas Indonesia',
-            'universitas indonesia': 'Universitas Indonesia',
-            'itb': 'Institut Teknologi Bandung',
-            'institut teknologi bandung': 'Institut Teknologi Bandung',
-            'ugm': 'Universitas Gadjah Mada',
-            'universitas gadjah mada': 'Universitas Gadjah Mada',
-            'its': 'Institut Teknologi Sepuluh Nopember',
-            'institut teknologi sepuluh nopember': 'Institut Teknologi Sepuluh Nopember',
-            'ipb': 'Institut Pertanian Bogor',
-            'institut pertanian bogor': 'Institut Pertanian Bogor',
-            'undip': 'Universitas Diponegoro',
-            'universitas diponegoro': 'Universitas Diponegoro',
-            'unair': 'Universitas Airlangga',
-            'universitas airlangga': 'Universitas Airlangga',
-            'unsri': 'Universitas Sriwijaya',
-            'universitas sriwijaya': 'Universitas Sriwijaya',
-            'unhas': 'Universitas Hasanuddin',
-            'universitas hasanuddin': 'Universitas Hasanuddin',
-            'unpad': 'Universitas Padjadjaran',
-            'universitas padjadjaran': 'Universitas Padjadjaran',
-            'uns': 'Universitas Sebelas Maret',
-            'universitas sebelas maret': 'Universitas Sebelas Maret',
-            'upi': 'Universitas Pendidikan Indonesia',
-            'universitas pendidikan indonesia': 'Universitas Pendidikan Indonesia',
-            'unesa': 'Universitas Negeri Surabaya',
-            'universitas negeri surabaya': 'Universitas Negeri Surabaya',
-            'uny': 'Universitas Negeri Yogyakarta',
-            'universitas negeri yogyakarta': 'Universitas Negeri Yogyakarta',
-            'unm': 'Universitas Negeri Makassar',
-            'universitas negeri makassar': 'Universitas Negeri Makassar',
-            'unp': 'Universitas Negeri Padang',
-            'universitas negeri padang': 'Universitas Negeri Padang',
-            'um': 'Universitas Negeri Malang',
-            'universitas negeri malang': 'Universitas Negeri Malang',
-            'unej': 'Universitas Jember',
-            'universitas jember': 'Universitas Jember',
-            'unsoed': 'Universitas Jenderal Soedirman',
-            'universitas jenderal soedirman': 'Universitas Jenderal Soedirman',
-            'untirta': 'Universitas Sultan Ageng Tirtayasa',
-            'universitas sultan ageng tirtayasa': 'Universitas Sultan Ageng Tirtayasa',
-            'untan': 'Universitas Tanjungpura',
-            'universitas tanjungpura': 'Universitas Tanjungpura',
-            'unsyiah': 'Universitas Syiah Kuala',
-            'universitas syiah kuala': 'Universitas Syiah Kuala',
-            'unand': 'Universitas Andalas',
-            'universitas andalas': 'Universitas Andalas',
-            'unri': 'Universitas Riau',
-            'universitas riau': 'Universitas Riau',
-            'usu': 'Universitas Sumatera Utara',
-            'universitas sumatera utara': 'Universitas Sumatera Utara',
-            
-            # Institut dan Politeknik
-            'itn': 'Institut Teknologi Nasional',
-            'itenas': 'Institut Teknologi Nasional',
-            'itera': 'Institut Teknologi Sumatera',
-            'institut teknologi sumatera': 'Institut Teknologi Sumatera',
-            'pens': 'Politeknik Elektronika Negeri Surabaya',
-            'politeknik elektronika negeri surabaya': 'Politeknik Elektronika Negeri Surabaya',
-            'pnj': 'Politeknik Negeri Jakarta',
-            'politeknik negeri jakarta': 'Politeknik Negeri Jakarta',
-            
-            # Universitas Swasta Terkenal
-            'uph': 'Universitas Pelita Harapan',
-            'universitas pelita harapan': 'Universitas Pelita Harapan',
-            'binus': 'Bina Nusantara University',
-            'bina nusantara': 'Bina Nusantara University',
-            'trisakti': 'Universitas Trisakti',
-            'universitas trisakti': 'Universitas Trisakti',
-            'atmajaya': 'Universitas Katolik Indonesia Atma Jaya',
-            'unika atma jaya': 'Universitas Katolik Indonesia Atma Jaya',
-            'tarumanagara': 'Universitas Tarumanagara',
-            'universitas tarumanagara': 'Universitas Tarumanagara',
-            'untar': 'Universitas Tarumanagara',
-            'paramadina': 'Universitas Paramadina',
-            'universitas paramadina': 'Universitas Paramadina',
-        }
+        # Per-instance memo caches, keyed on normalized text (see _cache_key)
+        self._detect_intent_cached = functools.lru_cache(maxsize=TEXT_CACHE_SIZE)(self._detect_intent_impl)
+        self._grades_cached = functools.lru_cache(maxsize=TEXT_CACHE_SIZE)(self._extract_grades_impl)
+        self._university_cached = functools.lru_cache(maxsize=TEXT_CACHE_SIZE)(self._extract_university_impl)
+        self._major_cached = functools.lru_cache(maxsize=TEXT_CACHE_SIZE)(self._extract_major_impl)
+        self._study_plan_cached = functools.lru_cache(maxsize=256)(self._study_plan_impl)
+        
+        # Whole-response cache for repeated prompts; responses are shared, treat them as read-only
+        self._process_cached = functools.lru_cache(maxsize=TEXT_CACHE_SIZE)(self._process_message_impl)
+        
+        # Optional near-duplicate cache (semantic_cache.SemanticCache)
+        self.semantic_cache = semantic_cache
         
     def _load_majors_kb(self, path: str) -> Dict:
-        """Load majors knowledge base"""
+        """Load majors knowledge base (memory-mapped from a Parquet sidecar when pyarrow is installed)"""
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            self._kb_table = load_kb_table(path)
+            if self._kb_table is not None:
+                return table_to_kb(self._kb_table)
+        except Exception as e:
+            print(f"Error loading majors KB table, falling back to JSON: {e}")
+            self._kb_table = None
+        
+        try:
+            if orjson is None:
+                with open(path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            
+            with open(path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size <= KB_MMAP_THRESHOLD:
+                    return orjson.loads(f.read())
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as buf:
+                    return orjson.loads(buf)
         except Exception as e:
             print(f"Error loading majors KB: {e}")
             return {}
     
+    def _prepare_kb(self) -> Tuple[Tuple[Dict, str, str], ...]:
+        """Lowercase and intern every KB major/university name once"""
+        return tuple(
+            (data, sys.intern((data.get('major') or '').lower()), sys.intern((data.get('university') or '').lower()))
+            for data in self.majors_kb.values()
+        )
+    
+    def _build_major_keyword_index(self) -> Dict[str, Tuple[int, ...]]:
+        """Map each major keyword (and each of its words) to the _kb_prep rows whose major contains it"""
+        needles = set(MAJOR_KEYWORDS) | {word for keyword in MAJOR_KEYWORDS for word in keyword.split()}
+        return {
+            needle: tuple(i for i, (_, kb_major, _) in enumerate(self._kb_prep) if needle in kb_major)
+            for needle in needles
+        }
+    
+    def _kb_rows_containing(self, needle: str) -> Tuple[int, ...]:
+        """_kb_prep rows whose lowercased major contains needle, in KB order"""
+        rows = self._major_keyword_index.get(needle)
+        if rows is None:
+            rows = tuple(i for i, (_, kb_major, _) in enumerate(self._kb_prep) if needle in kb_major)
+        return rows
+    
+    def _build_university_needles(self) -> Dict[str, Tuple[str, ...]]:
+        """Lowercased full university name -> (full name, aliases...) to search for in KB names"""
+        needles = {}
+        for alias, full in self.university_aliases.items():
+            full_lower = full.lower()
+            needles.setdefault(full_lower, (full_lower,))
+            needles[full_lower] += (alias.lower(),)
+        return needles
+    
+    def _build_kb_arrays(self) -> Dict[str, object]:
+        """Precompute a struct-of-arrays view of the KB for vectorized scoring"""
+        valid = np.array([bool(d.get('university') and d.get('major')) for d, _, _ in self._kb_prep], dtype=bool)
+        entries = [d for (d, _, _), ok in zip(self._kb_prep, valid) if ok]
+        majors_lower = [m for (_, m, _), ok in zip(self._kb_prep, valid) if ok]
+        programs = [self._determine_program_from_major(m) for m in majors_lower]
+        
+        return {
+            'entries': entries,
+            'programs': programs,
+            'required_rapor': self._kb_numeric_column('required_rapor', entries, valid),
+            'acceptance_rate': self._kb_numeric_column('acceptance_rate', entries, valid),
+            'program_id': np.array([PROGRAM_IDS[p] for p in programs], dtype=np.int8),
+            'bonus_category': np.array([_bonus_category(m) for m in majors_lower], dtype=np.int8),
+        }
+    
+    def _kb_numeric_column(self, name: str, entries: List[Dict], valid: np.ndarray) -> np.ndarray:
+        """KB column as float64; missing (or zero) values become NaN and contribute nothing"""
+        if self._kb_table is not None and name in self._kb_table.column_names:
+            # Straight from the Arrow buffer instead of one dict lookup per row
+            values = pc.cast(self._kb_table[name], pyarrow.float64()).to_numpy()[valid]
+            values[values == 0] = np.nan
+            return values
+        return np.array([d.get(name) or np.nan for d in entries], dtype=np.float64)
+    
     def _load_student_data(self, path: str) -> Optional[pd.DataFrame]:
-        """Load student historical data from Excel"""
+        """Load student historical data from Excel (cached as a Parquet sidecar)"""
+        excel_path = pathlib.Path(path)
+        parquet_path = excel_path.with_name(excel_path.name + '.parquet')
+        
         try:
-            return pd.read_excel(path)
+            if parquet_path.exists() and parquet_path.stat().st_mtime >= excel_path.stat().st_mtime:
+                return pd.read_parquet(parquet_path)
+        except Exception as e:
+            print(f"Ignoring student data cache: {e}")
+        
+        try:
+            df = self._read_student_excel(excel_path)
         except Exception as e:
             print(f"Error loading student data: {e}")
             return None
+        
+        try:
+            df.to_parquet(parquet_path, compression='zstd')
+        except Exception as e:  # no parquet engine, read-only dir, mixed-type columns
+            print(f"Could not cache student data as Parquet: {e}")
+        
+        return df
     
-    def _init_curriculum_map(self) -> Dict[str, Dict[str, List[str]]]:
-        """Initialize subject-topic mapping based on Indonesian SMA curriculum"""
-        return {
-            "saintek": {
-                "matematika": [
-                    "Fungsi, Komposisi, dan Invers",
-                    "Persamaan dan Pertidaksamaan",
-                    "Sistem Persamaan Linear",
-                    "Matriks dan Determinan",
-                    "Program Linear",
-                    "Barisan dan Deret",
-                    "Limit Fungsi",
-                    "Turunan dan Aplikasinya",
-                    "Integral dan Aplikasinya",
-                    "Trigonometri",
-                    "Dimensi Tiga",
-                    "Vektor",
-                    "Statistika dan Peluang"
-                ],
-                "fisika": [
-                    "Besaran dan Satuan",
-                    "Kinematika Gerak",
-                    "Dinamika Partikel",
-                    "Usaha dan Energi",
-                    "Momentum dan Impuls",
-                    "Rotasi dan Kesetimbangan Benda Tegar",
-                    "Elastisitas dan Hukum Hooke",
-                    "Fluida Statis dan Dinamis",
-                    "Suhu dan Kalor",
-                    "Termodinamika",
-                    "Gelombang Mekanik",
-                    "Bunyi",
-                    "Cahaya dan Optik",
-                    "Listrik Statis",
-                    "Listrik Dinamis",
-                    "Kemagnetan",
-                    "Induksi Elektromagnetik",
-                    "Arus Bolak-balik",
-                    "Radiasi Benda Hitam",
-                    "Teori Kuantum",
-                    "Fisika Atom dan Inti"
-                ],
-                "kimia": [
-                    "Struktur Atom dan Tabel Periodik",
-                    "Ikatan Kimia",
-                    "Bentuk Molekul",
-                    "Stoikiometri",
-                    "Larutan",
-                    "Reaksi Redoks",
-                    "Termokimia",
-                    "Laju Reaksi",
-                    "Kesetimbangan Kimia",
-                    "Kesetimbangan Ion dan pH",
-                    "Larutan Penyangga",
-                    "Hidrolisis Garam",
-                    "Kelarutan dan Hasil Kali Kelarutan",
-                    "Elektrokimia",
-                    "Kimia Unsur",
-                    "Senyawa Karbon",
-                    "Benzena dan Turunannya",
-                    "Makromolekul"
-                ],
-                "biologi": [
-                    "Keanekaragaman Hayati",
-                    "Virus",
-                    "Archaebacteria dan Eubacteria",
-                    "Protista",
-                    "Fungi",
-                    "Plantae",
-                    "Animalia",
-                    "Ekosistem",
-                    "Sel sebagai Unit Kehidupan",
-                    "Biomolekul",
-                    "Katabolisme dan Anabolisme",
-                    "Genetika",
-                    "Mutasi",
-                    "Evolusi",
-                    "Bioteknologi",
-                    "Sistem Organ pada Manusia",
-                    "Reproduksi dan Perkembangan"
-                ],
-                "bahasa_indonesia": [
-                    "Teks Laporan Hasil Observasi",
-                    "Teks Eksposisi",
-                    "Teks Anekdot",
-                    "Teks Hikayat",
-                    "Teks Negosiasi",
-                    "Teks Debat",
-                    "Teks Biografi",
-                    "Puisi",
-                    "Hikayat",
-                    "Novel",
-                    "Drama",
-                    "Kritik dan Esai",
-                    "Resensi"
-                ],
-                "bahasa_inggris": [
-                    "Expression and Greeting",
-                    "Congratulation and Compliment",
-                    "Asking and Giving Opinion",
-                    "Suggestion and Offer",
-                    "Announcement",
-                    "Recount Text",
-                    "Narrative Text",
-                    "Descriptive Text",
-                    "News Item",
-                    "Analytical Exposition",
-                    "Hortatory Exposition",
-                    "Explanation Text",
-                    "Discussion Text",
-                    "Review Text"
-                ]
-            },
-            "soshum": {
-                "matematika": [
-                    "Bilangan Real",
-                    "Persamaan dan Pertidaksamaan Linear",
-                    "Sistem Persamaan Linear Dua Variabel",
-                    "Fungsi Kuadrat",
-                    "Matematika Keuangan",
-                    "Barisan dan Deret Aritmatika",
-                    "Barisan dan Deret Geometri",
-                    "Statistika Deskriptif",
-                    "Peluang",
-                    "Kombinatorika"
-                ],
-                "ekonomi": [
-                    "Ilmu Ekonomi dan Masalah Ekonomi",
-                    "Sistem Ekonomi",
-                    "Kebutuhan dan Alat Pemuas Kebutuhan",
-                    "Perilaku Konsumen dan Produsen",
-                    "Pasar dan Terbentuknya Harga",
-                    "Elastisitas dan Penerapannya",
-                    "Konsep Produksi",
-                    "Biaya Produksi",
-                    "Pendapatan Nasional",
-                    "Pertumbuhan dan Pembangunan Ekonomi",
-                    "Ketenagakerjaan",
-                    "APBN dan APBD",
-                    "Perpajakan",
-                    "Uang dan Lembaga Keuangan",
-                    "Kebijakan Moneter dan Fiskal",
-                    "Perdagangan Internasional",
-                    "Neraca Pembayaran",
-                    "Kerjasama Ekonomi Internasional",
-                    "Akuntansi sebagai Sistem Informasi",
-                    "Persamaan Dasar Akuntansi",
-                    "Siklus Akuntansi",
-                    "Akuntansi Perusahaan Dagang",
-                    "Manajemen dan Badan Usaha",
-                    "Kewirausahaan"
-                ],
-                "geografi": [
-                    "Pengetahuan Dasar Geografi",
-                    "Penelitian Geografi",
-                    "Langkah Penelitian Geografi",
-                    "Dinamika Planet Bumi",
-                    "Hubungan Matahari, Bumi, dan Bulan",
-                    "Lapisan Bumi",
-                    "Lithosfer dan Pedosfer",
-                    "Atmosfer dan Hidrosfer",
-                    "Biosfer",
-                    "Antroposfer",
-                    "Sumber Daya Alam",
-                    "Ketahanan Pangan, Industri, dan Energi",
-                    "Kearifan dalam Pemanfaatan SDA",
-                    "Mitigasi dan Adaptasi Bencana Alam",
-                    "Dinamika Kependudukan",
-                    "Keragaman Budaya Indonesia",
-                    "Ketahanan Pangan Nasional",
-                    "Industri dan Pertanian",
-                    "Transportasi dan Tata Guna Lahan",
-                    "Interaksi Keruangan Desa dan Kota"
-                ],
-                "sejarah": [
-                    "Konsep Berpikir Sejarah",
-                    "Penelitian Sejarah",
-                    "Peradaban Awal Dunia",
-                    "Peradaban Awal Masyarakat Indonesia",
-                    "Perkembangan Negara-negara Tradisional",
-                    "Indonesia Zaman Hindu-Buddha",
-                    "Perkembangan Islam di Dunia",
-                    "Perkembangan Islam di Indonesia",
-                    "Revolusi Dunia dan Pengaruhnya",
-                    "Kolonialisme dan Imperialisme",
-                    "Pergerakan Nasional Indonesia",
-                    "Proklamasi dan Perkembangan Negara",
-                    "Dinasti Abbasiyah",
-                    "Perang Dunia dan Dampaknya",
-                    "Proklamasi Kemerdekaan RI",
-                    "Perkembangan Negara Kebangsaan",
-                    "Sistem dan Struktur Politik-Ekonomi Indonesia",
-                    "Kehidupan Politik dan Ekonomi Bangsa Indonesia",
-                    "Peran Bangsa Indonesia dalam Perdamaian Dunia"
-                ],
-                "sosiologi": [
-                    "Fungsi Sosiologi untuk Mengenali Gejala Sosial",
-                    "Individu, Kelompok, dan Hubungan Sosial",
-                    "Ragam Gejala Sosial dalam Masyarakat",
-                    "Rancangan Penelitian Sosial",
-                    "Pembentukan Kelompok Sosial",
-                    "Permasalahan Sosial dalam Masyarakat",
-                    "Perbedaan, Kesetaraan, dan Harmoni Sosial",
-                    "Konflik dan Integrasi dalam Kehidupan Sosial",
-                    "Kearifan Lokal dan Pemberdayaan Komunitas",
-                    "Ketimpangan Sosial sebagai Dampak Perubahan",
-                    "Globalisasi dan Perubahan Komunitas Lokal",
-                    "Penelitian Sosial dan Metode Penelitian"
-                ],
-                "bahasa_indonesia": [
-                    "Teks Laporan Hasil Observasi",
-                    "Teks Eksposisi",
-                    "Teks Anekdot",
-                    "Teks Hikayat",
-                    "Teks Negosiasi",
-                    "Teks Debat",
-                    "Teks Biografi",
-                    "Puisi",
-                    "Hikayat",
-                    "Novel",
-                    "Drama",
-                    "Kritik dan Esai",
-                    "Resensi"
-                ],
-                "bahasa_inggris": [
-                    "Expression and Greeting",
-                    "Congratulation and Compliment",
-                    "Asking and Giving Opinion",
-                    "Suggestion and Offer",
-                    "Announcement",
-                    "Recount Text",
-                    "Narrative Text",
-                    "Descriptive Text",
-                    "News Item",
-                    "Analytical Exposition",
-                    "Hortatory Exposition",
-                    "Explanation Text",
-                    "Discussion Text",
-                    "Review Text"
-                ]
-            }
+    @staticmethod
+    def _read_student_excel(path: pathlib.Path) -> pd.DataFrame:
+        """Read the Excel sheet with the Rust calamine engine when installed"""
+        # Only the known columns, grades as float32, strings Arrow-backed when possible
+        kwargs = {
+            'usecols': lambda column: column in _STUDENT_COLUMNS,
+            'dtype': {column: 'float32' for column in STUDENT_GRADE_COLUMNS},
         }
+        if pyarrow is not None:
+            kwargs['dtype_backend'] = 'pyarrow'
+        
+        try:
+            return pd.read_excel(path, engine='calamine', **kwargs)
+        except ImportError:
+            return pd.read_excel(path, **kwargs)
+    
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        """Normalize text for the keyword-based caches (intent, major)"""
+        return text.strip().lower()
     
     def extract_grades_from_text(self, text: str) -> Dict[str, float]:
         """Extract grade information from user input"""
-        grades = {}
-        
-        # Pattern untuk menangkap nilai dengan berbagai format
-        patterns = [
-            (r'matematika[:\s]*(?:nilai\s*)?(\d+(?:[.,]\d+)?)', 'matematika'),
-            (r'fisika[:\s]*(?:nilai\s*)?(\d+(?:[.,]\d+)?)', 'fisika'),
-            (r'kimia[:\s]*(?:nilai\s*)?(\d+(?:[.,]\d+)?)', 'kimia'),
-            (r'biologi[:\s]*(?:nilai\s*)?(\d+(?:[.,]\d+)?)', 'biologi'),
-            (r'ekonomi[:\s]*(?:nilai\s*)?(\d+(?:[.,]\d+)?)', 'ekonomi'),
-            (r'geografi[:\s]*(?:nilai\s*)?(\d+(?:[.,]\d+)?)', 'geografi'),
-            (r'sejarah[:\s]*(?:nilai\s*)?(\d+(?:[.,]\d+)?)', 'sejarah'),
-            (r'sosiologi[:\s]*(?:nilai\s*)?(\d+(?:[.,]\d+)?)', 'sosiologi'),
-            (r'bahasa\s*indonesia[:\s]*(?:nilai\s*)?(\d+(?:[.,]\d+)?)', 'bahasa_indonesia'),
-            (r'bahasa\s*inggris[:\s]*(?:nilai\s*)?(\d+(?:[.,]\d+)?)', 'bahasa_inggris'),
-            (r'(?:rata[:\s-]*rata|rapor)[:\s]*(?:nilai\s*)?(\d+(?:[.,]\d+)?)', 'rata_rata'),
-            (r'(?:nilai\s+)?(\d+(?:[.,]\d+)?)[:\s]*matematika', 'matematika'),
-            (r'(?:nilai\s+)?(\d+(?:[.,]\d+)?)[:\s]*fisika', 'fisika'),
-            (r'(?:nilai\s+)?(\d+(?:[.,]\d+)?)[:\s]*kimia', 'kimia'),
-            (r'(?:nilai\s+)?(\d+(?:[.,]\d+)?)[:\s]*biologi', 'biologi')
-        ]
+        if not _DIGIT_RE.search(text):
+            return {}
         
-        text_lower = text.lower()
+        # Copy on read: callers (e.g. recommend_majors_by_grades) mutate the result.
+        # The grade regex ignores case, so only whitespace is normalized
+        return dict(self._grades_cached(text.strip()))
+    
+    def _extract_grades_impl(self, text: str) -> MappingProxyType:
+        grades = {}
         
-        for pattern, subject in patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                value_str = match.group(1).replace(',', '.')
-                try:
-                    value = float(value_str)
-                    if 0 <= value <= 100:  # Validasi range nilai
-                        grades[subject] = value
-                except ValueError:
-                    continue
+        # Single scan over the text; the first valid value per subject wins
+        for match in _GRADE_RE.finditer(text):
+            subject = _GRADE_GROUP_TO_SUBJECT[match.lastgroup]
+            if subject in grades:
+                continue
+            value = float(match.group(match.lastgroup).replace(',', '.'))
+            if 0 <= value <= 100:  # Validasi range nilai
+                grades[subject] = value
         
-        return grades
+        # Matches come in message order; list them in pattern order, as the per-pattern search did
+        return MappingProxyType(dict(sorted(grades.items(), key=lambda item: _GRADE_SUBJECT_RANK[item[0]])))
+    
+    def _init_intent_automaton(self) -> KeywordAutomaton:
+        """Tag every intent keyword with its bucket in one automaton"""
+        return KeywordAutomaton(
+            (keyword, bucket) for bucket, keywords in INTENT_KEYWORDS.items() for keyword in keywords
+        )
     
     def detect_intent(self, text: str) -> str:
         """Detect user intent from input text with improved logic"""
-        text_lower = text.lower()
-        
-        # Check for grade information first
-        grades = self.extract_grades_from_text(text)
-        has_grades = len(grades) > 0
+        text_lower = self._cache_key(text)
+        if not text_lower:
+            return 'general'
+        return self._detect_intent_cached(text_lower)
+    
+    def _detect_intent_impl(self, text_lower: str) -> str:
+        """Intent for already-normalized text; sub-extractors reuse it via their caches"""
+        # One pass over the text yields every keyword bucket present
+        buckets = {bucket for _, _, bucket in self._intent_automaton.iter(text_lower)}
+        
+        # Check for grade information first; full extraction only runs when
+        # there is a digit and the grade regex hits at all
+        has_grades = (
+            _DIGIT_RE.search(text_lower) is not None
+            and _GRADE_RE.search(text_lower) is not None
+            and bool(self._grades_cached(text_lower))
+        )
         
-        # Keywords for different intents
-        major_target_keywords = ['ingin', 'mau', 'pengen', 'target', 'cita-cita', 'impian', 'masuk']
-        major_info_keywords = ['cocok', 'sesuai', 'rekomendasi', 'saran', 'jurusan apa']
-        study_keywords = ['belajar', 'tips', 'cara', 'strategi', 'meningkatkan', 'persiapan', 'utbk']
-        info_keywords = ['info', 'informasi', 'passing grade', 'persyaratan', 'syarat']
+        # Intent decision logic
+        if has_grades and 'major_info' in buckets:
+            return 'grade_to_major'
         
         # Specific major detection
-        major_mentioned = self._extract_major_from_text(text)
-        university_mentioned = self._extract_university_from_text(text)
+        major_mentioned = self._major_cached(text_lower)
+        major_or_university = major_mentioned or self._university_cached(text_lower)
         
-        # Intent decision logic
-        if has_grades and any(keyword in text_lower for keyword in major_info_keywords):
-            return 'grade_to_major'
-        elif any(keyword in text_lower for keyword in major_target_keywords) and (major_mentioned or university_mentioned):
+        if 'major_target' in buckets and major_or_university:
             return 'major_preparation'
-        elif any(keyword in text_lower for keyword in study_keywords):
+        elif 'study' in buckets:
             return 'study_tips'
-        elif any(keyword in text_lower for keyword in info_keywords) and (major_mentioned or university_mentioned):
+        elif 'info' in buckets and major_or_university:
             return 'major_info'
         elif major_mentioned and not has_grades:
             return 'major_preparation'
@@ -441,25 +1055,22 @@ class EducationChatbot:
     
     def _extract_university_from_text(self, text: str) -> str:
         """Extract university name from text using aliases"""
-        text_lower = text.lower()
-        
-        # Check aliases first (shorter matches)
-        for alias, full_name in self.university_aliases.items():
-            if alias in text_lower:
-                return full_name
+        return self._university_cached(text.strip())
+    
+    def _extract_university_impl(self, text: str) -> str:
+        # Both regexes ignore case, so the raw text is matched as-is
+        # Check aliases first (whole words only): longest alias wins, leftmost on ties
+        best = None
+        for match in self._alias_re.finditer(text):
+            if best is None or len(match.group(1)) > len(best):
+                best = match.group(1)
+        if best:
+            return self.university_aliases[best.lower()]
         
         # Check for university patterns
-        university_patterns = [
-            r'universitas\s+([a-zA-Z\s]+)',
-            r'institut\s+([a-zA-Z\s]+)',
-            r'politeknik\s+([a-zA-Z\s]+)',
-            r'sekolah\s+tinggi\s+([a-zA-Z\s]+)'
-        ]
-        
-        for pattern in university_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                return match.group(0).title()
+        match = _UNI_REGEX.search(text)
+        if match:
+            return match.group(0).title()
         
         return ""
     
@@ -471,8 +1082,6 @@ class EducationChatbot:
     
     def recommend_majors_by_grades(self, grades: Dict[str, float], program: str = None) -> List[Dict]:
         """Recommend majors based on current grades"""
-        recommendations = []
-        
         # Calculate average if not provided
         if 'rata_rata' not in grades:
             grade_values = [v for k, v in grades.items() if k != 'rata_rata']
@@ -485,36 +1094,68 @@ class EducationChatbot:
         if not program:
             program = self._determine_program_from_grades(grades)
         
-        # Filter majors based on KB data
-        for key, major_data in self.majors_kb.items():
-            # Skip if no relevant data
-            if not major_data.get('university') or not major_data.get('major'):
-                continue
-                
-            # Determine major program type
-            major_name = major_data.get('major', '').lower()
-            major_program = self._determine_program_from_major(major_name)
-            
-            # Skip if program doesn't match
-            if program != 'unknown' and major_program != 'unknown' and program != major_program:
-                continue
-            
-            # Calculate recommendation score
-            recommendation = self._calculate_recommendation_score(major_data, grades, avg_grade)
-            if recommendation:
-                recommendations.append(recommendation)
-        
-        # Sort by probability and limit results
-        recommendations.sort(key=lambda x: x['probability'], reverse=True)
-        return recommendations[:15]
+        kb = self._kb_arr
+        
+        # Skip majors whose program doesn't match
+        if program == 'unknown':
+            candidates = np.arange(len(kb['entries']))
+        else:
+            candidates = np.flatnonzero(kb['program_id'] == PROGRAM_IDS.get(program, -1))
+        
+        probabilities = self._score_majors(kb, candidates, self._bonus_condition_bits(grades), avg_grade)
+        
+        # Sort by probability and limit results; only the winners become dicts
+        top = _top_k_indices(_round3(probabilities), 15)
+        return [
+            self._format_recommendation(kb, candidates[i], float(probabilities[i]), avg_grade)
+            for i in top
+        ]
+    
+    def recommend_majors_batch(self, grades_df: pd.DataFrame, k: int = 15) -> List[List[Dict]]:
+        """Recommend majors for many students at once, one row of grades per student.
+        
+        Columns use the same subject keys as extract_grades_from_text; NaN means
+        the grade is missing. Each row gives the same result as
+        recommend_majors_by_grades on that student's grades.
+        """
+        kb = self._kb_arr
+        subjects = [column for column in grades_df.columns if column != 'rata_rata']
+        values = grades_df[subjects].to_numpy(dtype=np.float64)  # (S, n_subjects)
+        present = ~np.isnan(values)
+        
+        # Average of the given grades (75 when none), unless rata_rata is given
+        counts = present.sum(axis=1)
+        avg = np.where(counts > 0, np.where(present, values, 0.0).sum(axis=1) / np.maximum(counts, 1), 75.0)
+        if 'rata_rata' in grades_df.columns:
+            given = grades_df['rata_rata'].to_numpy(dtype=np.float64)
+            avg = np.where(np.isnan(given), avg, given)
+        
+        # Program per student, same rule as _determine_program_from_grades
+        def count(group):
+            return present[:, [i for i, subject in enumerate(subjects) if subject in group]].sum(axis=1)
+        program_id = np.where(
+            count(SOSHUM_GRADE_SUBJECTS) > count(SAINTEK_GRADE_SUBJECTS), PROGRAM_IDS['soshum'], PROGRAM_IDS['saintek']
+        )
+        
+        # (S, N) probabilities for every student against every KB row
+        candidates = np.arange(len(kb['entries']))
+        probabilities = self._score_majors(kb, candidates, self._bonus_condition_bits_batch(values, subjects), avg[:, None])
+        rounded = np.where(kb['program_id'][None, :] == program_id[:, None], _round3(probabilities), -np.inf)
+        
+        results = []
+        for s in range(len(values)):
+            top = _top_k_indices(rounded[s], k)
+            top = top[np.isfinite(rounded[s, top])]
+            results.append([
+                self._format_recommendation(kb, i, float(probabilities[s, i]), float(avg[s]))
+                for i in top
+            ])
+        return results
     
     def _determine_program_from_grades(self, grades: Dict[str, float]) -> str:
         """Determine program based on available grades"""
-        saintek_subjects = ['matematika', 'fisika', 'kimia', 'biologi']
-        soshum_subjects = ['ekonomi', 'geografi', 'sejarah', 'sosiologi']
-        
-        saintek_count = sum(1 for subj in saintek_subjects if subj in grades)
-        soshum_count = sum(1 for subj in soshum_subjects if subj in grades)
+        saintek_count = sum(1 for subj in SAINTEK_GRADE_SUBJECTS if subj in grades)
+        soshum_count = sum(1 for subj in SOSHUM_GRADE_SUBJECTS if subj in grades)
         
         if saintek_count > soshum_count:
             return 'saintek'
@@ -523,41 +1164,35 @@ class EducationChatbot:
         else:
             return 'saintek'  # Default to saintek
     
-    def _calculate_recommendation_score(self, major_data: Dict, grades: Dict[str, float], avg_grade: float) -> Optional[Dict]:
-        """Calculate recommendation score for a major"""
-        # Get required average from KB (if available)
-        required_rapor = major_data.get('required_rapor')
-        passing_grade = major_data.get('passing_grade')
-        acceptance_rate = major_data.get('acceptance_rate')
-        
-        # Use multiple criteria for scoring
-        base_score = avg_grade
+    def _score_majors(self, kb: Dict[str, object], idx: np.ndarray, bits: np.ndarray, avg_grade) -> np.ndarray:
+        """Calculate recommendation probabilities for the KB rows in idx.
         
-        # Calculate probability based on multiple factors
-        probability = 0.5  # Base probability
+        bits/avg_grade are per student; with a leading student axis ((S, C) bits,
+        (S, 1) averages) the result is an (S, len(idx)) matrix.
+        """
+        required_rapor = kb['required_rapor'][idx]
+        acceptance_rate = kb['acceptance_rate'][idx]
         
-        # Factor 1: Rapor requirement
-        if required_rapor:
-            grade_diff = avg_grade - required_rapor
-            if grade_diff >= 0:
-                probability += min(0.4, grade_diff / 50)  # Max 0.4 bonus
-            else:
-                probability += max(-0.3, grade_diff / 50)  # Max 0.3 penalty
+        # Factor 1: Rapor requirement (max 0.4 bonus, max 0.3 penalty)
+        with np.errstate(invalid='ignore'):
+            rapor_term = np.clip((avg_grade - required_rapor) / 50, -0.3, 0.4)
+        rapor_term = np.where(np.isnan(required_rapor), 0.0, rapor_term)
         
         # Factor 2: Acceptance rate
-        if acceptance_rate:
-            if acceptance_rate > 20:
-                probability += 0.1
-            elif acceptance_rate < 5:
-                probability -= 0.2
+        with np.errstate(invalid='ignore'):
+            acceptance_term = np.where(acceptance_rate > 20, 0.1, np.where(acceptance_rate < 5, -0.2, 0.0))
         
-        # Factor 3: Subject-specific bonus
-        major_name = major_data.get('major', '').lower()
-        subject_bonus = self._get_subject_bonus(major_name, grades)
-        probability += subject_bonus
+        # Factor 3: Subject-specific bonus, one table gather per major
+        category = kb['bonus_category'][idx]
+        bonus = BONUS_TABLE[category, bits[..., category]]
         
-        # Clamp probability between 0.05 and 0.95
-        probability = max(0.05, min(0.95, probability))
+        # Base probability 0.5, clamped between 0.05 and 0.95
+        return np.clip(0.5 + rapor_term + acceptance_term + bonus, 0.05, 0.95)
+    
+    def _format_recommendation(self, kb: Dict[str, object], i: int, probability: float, avg_grade: float) -> Dict:
+        """Build the recommendation dict for KB row i"""
+        major_data = kb['entries'][i]
+        required_rapor = major_data.get('required_rapor')
         
         # Determine category
         if probability >= 0.8:
@@ -578,39 +1213,36 @@ class EducationChatbot:
             'current_gap': round((required_rapor or avg_grade) - avg_grade, 2),
             'probability': round(probability, 3),
             'category': category,
-            'acceptance_rate': acceptance_rate,
-            'passing_grade': passing_grade,
-            'program': self._determine_program_from_major(major_data.get('major', ''))
+            'acceptance_rate': major_data.get('acceptance_rate'),
+            'passing_grade': major_data.get('passing_grade'),
+            'program': kb['programs'][i]
         }
     
-    def _get_subject_bonus(self, major_name: str, grades: Dict[str, float]) -> float:
-        """Calculate subject-specific bonus for major recommendation"""
-        bonus = 0.0
-        
-        # Subject relevance mapping
-        if 'teknik' in major_name or 'informatika' in major_name:
-            if 'matematika' in grades and grades['matematika'] >= 85:
-                bonus += 0.15
-            if 'fisika' in grades and grades['fisika'] >= 80:
-                bonus += 0.1
-        elif 'kedokteran' in major_name or 'farmasi' in major_name:
-            if 'biologi' in grades and grades['biologi'] >= 85:
-                bonus += 0.15
-            if 'kimia' in grades and grades['kimia'] >= 80:
-                bonus += 0.1
-        elif 'ekonomi' in major_name or 'manajemen' in major_name:
-            if 'matematika' in grades and grades['matematika'] >= 80:
-                bonus += 0.1
-            if 'ekonomi' in grades and grades['ekonomi'] >= 85:
-                bonus += 0.15
-        elif 'hukum' in major_name:
-            if 'bahasa_indonesia' in grades and grades['bahasa_indonesia'] >= 85:
-                bonus += 0.15
-        
-        return min(bonus, 0.2)  # Max 0.2 bonus
+    def _bonus_condition_bits(self, grades: Dict[str, float]) -> np.ndarray:
+        """Evaluate the BONUS_RULES predicates once per category"""
+        bits = np.zeros(len(BONUS_RULES), dtype=np.int8)
+        for category_id, rules in enumerate(BONUS_RULES):
+            for bit, rule in enumerate(rules):
+                if rule and rule[0] in grades and grades[rule[0]] >= rule[1]:
+                    bits[category_id] |= 1 << bit
+        return bits
+    
+    def _bonus_condition_bits_batch(self, values: np.ndarray, subjects: List[str]) -> np.ndarray:
+        """(S, C) version of _bonus_condition_bits for a grade matrix (NaN = missing)"""
+        column = {subject: i for i, subject in enumerate(subjects)}
+        bits = np.zeros((len(values), len(BONUS_RULES)), dtype=np.int8)
+        for category_id, rules in enumerate(BONUS_RULES):
+            for bit, rule in enumerate(rules):
+                if rule and rule[0] in column:
+                    bits[values[:, column[rule[0]]] >= rule[1], category_id] |= 1 << bit
+        return bits
     
     def get_study_plan_for_major(self, major_name: str, program: str = 'saintek') -> List[SubjectTopic]:
         """Generate study plan for specific major"""
+        return list(self._study_plan_cached(major_name, program))
+    
+    def _study_plan_impl(self, major_name: str, program: str) -> Tuple[SubjectTopic, ...]:
+        """Build the study plan for (major, program); memoized, the result is shared"""
         study_plan = []
         
         # Get curriculum for the program
@@ -628,178 +1260,136 @@ class EducationChatbot:
                 
                 study_plan.append(SubjectTopic(
                     subject=subject,
-                    topics=topics,
+                    topics=tuple(topics),
                     difficulty=difficulty
                 ))
         
-        return study_plan
+        return tuple(study_plan)
     
     def _get_priority_subjects_for_major(self, major_name: str, program: str) -> Dict[str, str]:
         """Get priority subjects for specific major"""
-        # Enhanced major-subject mappings
-        major_mappings = {
-            'saintek': {
-                'teknik': {'matematika': 'high', 'fisika': 'high', 'bahasa_inggris': 'medium'},
-                'informatika': {'matematika': 'high', 'fisika': 'medium', 'bahasa_inggris': 'high'},
-                'kedokteran': {'biologi': 'high', 'kimia': 'high', 'fisika': 'medium', 'matematika': 'medium'},
-                'farmasi': {'kimia': 'high', 'biologi': 'high', 'matematika': 'medium'},
-                'arsitektur': {'matematika': 'high', 'fisika': 'high', 'bahasa_inggris': 'medium'},
-                'biologi': {'biologi': 'high', 'kimia': 'medium', 'matematika': 'medium'},
-                'kimia': {'kimia': 'high', 'matematika': 'high', 'fisika': 'medium'},
-                'fisika': {'fisika': 'high', 'matematika': 'high'},
-                'matematika': {'matematika': 'high', 'fisika': 'medium'},
-                'default': {'matematika': 'high', 'fisika': 'medium', 'kimia': 'medium', 'biologi': 'medium', 'bahasa_indonesia': 'basic', 'bahasa_inggris': 'basic'}
-            },
-            'soshum': {
-                'ekonomi': {'matematika': 'high', 'ekonomi': 'high', 'bahasa_inggris': 'medium'},
-                'hukum': {'bahasa_indonesia': 'high', 'sejarah': 'medium', 'sosiologi': 'medium'},
-                'komunikasi': {'bahasa_indonesia': 'high', 'bahasa_inggris': 'high', 'sosiologi': 'medium'},
-                'psikologi': {'matematika': 'medium', 'sosiologi': 'high', 'bahasa_indonesia': 'medium'},
-                'administrasi': {'ekonomi': 'high', 'sosiologi': 'medium', 'bahasa_indonesia': 'medium'},
-                'hubungan internasional': {'bahasa_inggris': 'high', 'sejarah': 'high', 'geografi': 'medium'},
-                'manajemen': {'matematika': 'high', 'ekonomi': 'high', 'bahasa_inggris': 'medium'},
-                'akuntansi': {'matematika': 'high', 'ekonomi': 'high'},
-                'default': {'ekonomi': 'high', 'sejarah': 'medium', 'geografi': 'medium', 'sosiologi': 'medium', 'matematika': 'medium', 'bahasa_indonesia': 'medium', 'bahasa_inggris': 'basic'}
-            }
-        }
-        
-        program_mapping = major_mappings.get(program, {})
-        
         # Find matching major category
-        for category, subjects in program_mapping.items():
-            if category == 'default':
-                continue
-            if category in major_name or any(keyword in major_name for keyword in category.split()):
+        for category, keywords, subjects in _MAJOR_CATEGORY_KEYWORDS.get(program, ()):
+            if category in major_name or any(keyword in major_name for keyword in keywords):
                 return subjects
         
-        return program_mapping.get('default', {})
+        return _MAJOR_MAPPINGS.get(program, {}).get('default', {})
     
-    def _filter_topics_for_major(self, subject: str, all_topics: List[str], major_name: str) -> List[str]:
+    def _filter_topics_for_major(self, subject: str, all_topics: Tuple[str, ...], major_name: str) -> Tuple[str, ...]:
         """Filter and prioritize topics based on major requirements"""
-        # Major-specific topic prioritization
-        if subject == 'matematika':
-            if 'teknik' in major_name or 'informatika' in major_name:
-                priority_topics = ['Fungsi, Komposisi, dan Invers', 'Limit Fungsi', 'Turunan dan Aplikasinya', 
-                                 'Integral dan Aplikasinya', 'Trigonometri', 'Vektor']
-            elif 'ekonomi' in major_name:
-                priority_topics = ['Sistem Persamaan Linear', 'Program Linear', 'Statistika dan Peluang', 
-                                 'Barisan dan Deret', 'Matematika Keuangan']
-            else:
-                priority_topics = all_topics[:8]
-        elif subject == 'fisika' and ('teknik' in major_name or 'informatika' in major_name):
-            priority_topics = ['Kinematika Gerak', 'Dinamika Partikel', 'Usaha dan Energi', 
-                             'Listrik Statis', 'Listrik Dinamis', 'Kemagnetan']
-        elif subject == 'biologi' and 'kedokteran' in major_name:
-            priority_topics = ['Sel sebagai Unit Kehidupan', 'Sistem Organ pada Manusia', 
-                             'Genetika', 'Biomolekul', 'Reproduksi dan Perkembangan']
-        else:
-            priority_topics = all_topics[:6]
-        
-        # Ensure we don't exceed available topics
-        return priority_topics[:min(len(priority_topics), len(all_topics))]
+        # Major-specific topic prioritization: first tag with an entry for this subject wins
+        for tag in _topic_tags(major_name):
+            priority_topics = _TOPIC_PRIORITY.get((subject, tag))
+            if priority_topics is not None:
+                # Ensure we don't exceed available topics
+                return priority_topics[:len(all_topics)]
+        
+        return all_topics[:_TOPIC_DEFAULT_COUNT.get(subject, 6)]
     
     def process_message(self, message: str) -> ChatbotResponse:
         """Main method to process user message"""
-        intent = self.detect_intent(message)
-        
+        return self._process_cached(message)
+    
+    def _process_message_impl(self, message: str) -> ChatbotResponse:
+        # Normalize once; intent detection and every handler work on text_lower
+        text_lower = self._cache_key(message)
+        if not text_lower:
+            return _GENERAL_RESPONSE
+        intent = self._detect_intent_cached(text_lower)
+        
+        # Only the KB-driven replies are worth a semantic lookup: general/tips are
+        # constants and grade replies depend on exact numbers. Namespacing by the
+        # extracted major/university means a paraphrase never returns the answer
+        # for a different major or campus
+        if self.semantic_cache is not None and intent in SEMANTIC_CACHE_INTENTS:
+            namespace = f"{intent}|{self._major_cached(text_lower)}|{self._university_cached(text_lower)}"
+            try:
+                embedding = self.semantic_cache.embed(message)  # shared by lookup and put
+                cached = self.semantic_cache.lookup(message, namespace, embedding)
+                if cached is not None:
+                    return _response_from_json(cached)
+                response = self._dispatch_intent(intent, text_lower)
+                self.semantic_cache.put(message, namespace, _response_to_json(response), embedding)
+                return response
+            except Exception as e:
+                print(f"Semantic cache error: {e}")
+        
+        return self._dispatch_intent(intent, text_lower)
+    
+    def _dispatch_intent(self, intent: str, text_lower: str) -> ChatbotResponse:
+        """Run the handler for intent on the normalized message"""
         if intent == 'grade_to_major':
-            return self._handle_grade_to_major(message)
+            return self._handle_grade_to_major(text_lower)
         elif intent == 'major_preparation':
-            return self._handle_major_preparation(message)
+            return self._handle_major_preparation(text_lower)
         elif intent == 'study_tips':
-            return self._handle_study_tips(message)
+            return self._handle_study_tips(text_lower)
         elif intent == 'major_info':
-            return self._handle_major_info(message)
+            return self._handle_major_info(text_lower)
         else:
-            return self._handle_general(message)
+            return self._handle_general(text_lower)
     
-    def _handle_grade_to_major(self, message: str) -> ChatbotResponse:
+    def _handle_grade_to_major(self, text_lower: str) -> ChatbotResponse:
         """Handle grade-based major recommendation with detailed analysis"""
-        grades = self.extract_grades_from_text(message)
+        grades = self.extract_grades_from_text(text_lower)
         
         if not grades:
-            return ChatbotResponse(
-                message="""📊 **Untuk memberikan rekomendasi jurusan yang akurat, saya perlu informasi nilai rapor Anda.**
-
-Contoh format yang bisa Anda gunakan:
-• "Nilai matematika 85, fisika 80, kimia 78, rata-rata 82"
-• "Rapor saya: matematika 90, biologi 88, kimia 85"
-• "Nilai rata-rata rapor saya 85, matematika 88, fisika 82"
-
-Sertakan juga nilai mata pelajaran yang relevan dengan minat Anda! 🎯""",
-                recommendations=[],
-                study_plan=[],
-                confidence=0.3
-            )
+            return _NO_GRADES_RESPONSE
         
         # Determine program based on mentioned subjects
         program = self._determine_program_from_grades(grades)
         recommendations = self.recommend_majors_by_grades(grades, program)
         
-        avg_grade = grades.get('rata_rata', sum(grades.values()) / len(grades))
+        # recommend_majors_by_grades fills in rata_rata when the text had none
+        avg_grade = grades['rata_rata']
         
-        # Categorize recommendations
-        very_likely = [r for r in recommendations if r['probability'] > 0.8]
-        likely = [r for r in recommendations if 0.6 <= r['probability'] <= 0.8]
-        possible = [r for r in recommendations if 0.4 <= r['probability'] < 0.6]
+        # Categorize recommendations in one pass
+        very_likely, likely, possible = [], [], []
+        for r in recommendations:
+            p = r['probability']
+            if p > 0.8:
+                very_likely.append(r)
+            elif p >= 0.6:
+                likely.append(r)
+            elif p >= 0.4:
+                possible.append(r)
         
         # Generate personalized guidance
         guidance = self._generate_personalized_guidance(grades, avg_grade, very_likely, likely, possible)
         
-        message = f"""📊 **Analisis Nilai Rapor Anda (Rata-rata: {avg_grade:.1f})**
-
-{self._format_grade_breakdown(grades)}
-
-🎯 **REKOMENDASI JURUSAN:**
-
-🟢 **PELUANG BESAR (>80%)** - Sangat Direkomendasikan:
-{self._format_major_list(very_likely, show_details=True)}
-
-🟡 **PELUANG SEDANG (60-80%)** - Layak Dipertimbangkan:
-{self._format_major_list(likely, show_details=True)}
-
-🟠 **PELUANG KECIL (40-60%)** - Perlu Usaha Ekstra:
-{self._format_major_list(possible, show_details=True)}
-
-💡 **PANDUAN PERSONAL:**
-{guidance}
-
-🤔 **Masih bingung memilih?** Ceritakan minat dan cita-cita Anda, saya akan membantu mengarahkan pilihan yang tepat!"""
+        message = "".join((
+            _GRADE_TO_MAJOR_HEADER.format(avg_grade),
+            self._format_grade_breakdown(grades),
+            _GRADE_TO_MAJOR_VERY_LIKELY,
+            self._format_major_list(very_likely, show_details=True),
+            _GRADE_TO_MAJOR_LIKELY,
+            self._format_major_list(likely, show_details=True),
+            _GRADE_TO_MAJOR_POSSIBLE,
+            self._format_major_list(possible, show_details=True),
+            _GRADE_TO_MAJOR_GUIDANCE,
+            guidance,
+            _GRADE_TO_MAJOR_FOOTER,
+        ))
         
         return ChatbotResponse(
             message=message,
-            recommendations=recommendations,
-            study_plan=[],
+            recommendations=tuple(recommendations),
+            study_plan=(),
             confidence=0.95
         )
     
-    def _handle_major_preparation(self, message: str) -> ChatbotResponse:
+    def _handle_major_preparation(self, text_lower: str) -> ChatbotResponse:
         """Handle major preparation requests with comprehensive guidance"""
         # Extract major and university name from message
-        major_keywords = self._extract_major_from_text(message)
-        university_name = self._extract_university_from_text(message)
+        major_keywords = self._major_cached(text_lower)
+        university_name = self._university_cached(text_lower)
         
         if not major_keywords:
-            return ChatbotResponse(
-                message="""🤔 **Untuk memberikan panduan yang tepat, mohon sebutkan jurusan yang Anda targetkan.**
-
-Contoh:
-• "Saya ingin masuk Teknik Informatika"
-• "Target saya Kedokteran di UI"
-• "Mau ke jurusan Ekonomi ITB"
-
-Atau jika masih bingung memilih jurusan, coba ceritakan:
-• Mata pelajaran favorit Anda
-• Bidang yang Anda minati
-• Cita-cita karir Anda""",
-                recommendations=[],
-                study_plan=[],
-                confidence=0.3
-            )
+            return _NO_TARGET_MAJOR_RESPONSE
         
         # Determine program
         program = self._determine_program_from_major(major_keywords)
-        study_plan = self.get_study_plan_for_major(major_keywords, program)
+        study_plan = self._study_plan_cached(major_keywords, program)
         
         # Get specific recommendations for the major
         major_tips = self._get_major_specific_tips(major_keywords, university_name)
@@ -807,88 +1397,41 @@ Atau jika masih bingung memilih jurusan, coba ceritakan:
         # Find related majors in KB for additional context
         related_majors = self._find_related_majors(major_keywords, university_name)
         
-        message = f"""🎯 **Panduan Persiapan untuk {major_keywords.title()}**
-{f"di {university_name}" if university_name else ""}
-
-📚 **Mata Pelajaran yang Harus Dikuasai:**
-
-{self._format_study_plan(study_plan)}
-
-💡 **Tips Khusus untuk {major_keywords.title()}:**
-{major_tips}
-
-📊 **Informasi Tambahan:**
-{self._format_related_majors_info(related_majors)}
-
-🎯 **Strategi Persiapan:**
-1. **Fokus Utama**: Kuasai mata pelajaran inti dengan baik
-2. **Latihan Rutin**: Kerjakan soal-soal UTBK 3-5 tahun terakhir
-3. **Target Nilai**: Usahakan nilai rapor minimal 85 untuk mata pelajaran inti
-4. **Pengalaman**: Ikuti olimpiade/kompetisi yang relevan jika memungkinkan
-5. **Backup Plan**: Siapkan 2-3 pilihan jurusan alternatif
-
-💪 **Jangan lupa untuk konsisten belajar dan tetap semangat!**"""
+        message = _MAJOR_PREPARATION_TEMPLATE.format_map({
+            'major_title': major_keywords.title(),
+            'university_line': f"di {university_name}" if university_name else "",
+            'study_plan': self._format_study_plan(study_plan),
+            'major_tips': major_tips,
+            'related_info': self._format_related_majors_info(related_majors),
+        })
         
         return ChatbotResponse(
             message=message,
-            recommendations=related_majors,
+            recommendations=tuple(related_majors),
             study_plan=study_plan,
             confidence=0.9
         )
     
-    def _handle_study_tips(self, message: str) -> ChatbotResponse:
+    def _handle_study_tips(self, text_lower: str) -> ChatbotResponse:
         """Handle study tips requests"""
-        message = """📚 **Tips Belajar Efektif untuk UTBK**
-
-🎯 **Strategi Umum**:
-• Buat jadwal belajar harian yang konsisten
-• Gunakan teknik Pomodoro (25 menit fokus, 5 menit istirahat)
-• Belajar dari buku referensi dan soal-soal UTBK terbaru
-• Bergabung dengan grup belajar atau komunitas online
-
-📖 **Per Mata Pelajaran**:
-• **Matematika**: Pahami konsep dasar, latihan soal bertahap dari mudah ke sulit
-• **Fisika**: Kuasai rumus, pahami konsep, banyak latihan soal cerita
-• **Kimia**: Hafal tabel periodik, pahami reaksi kimia, latihan stoikiometri
-• **Biologi**: Buat mind map, hafal istilah penting, pahami proses biologis
-
-⏰ **Manajemen Waktu**:
-• Alokasikan waktu lebih banyak untuk mata pelajaran yang lemah
-• Sisakan waktu untuk review dan latihan soal campuran
-• Jangan lupa istirahat dan menjaga kesehatan
-
-🎯 **Target Harian**: Minimal 3-4 jam belajar efektif per hari"""
-        
-        return ChatbotResponse(
-            message=message,
-            recommendations=[],
-            study_plan=[],
-            confidence=0.7
-        )
+        return _STUDY_TIPS_RESPONSE
     
-    def _handle_major_info(self, message: str) -> ChatbotResponse:
+    def _handle_major_info(self, text_lower: str) -> ChatbotResponse:
         """Handle major information requests"""
-        major_name = self._extract_major_from_text(message)
+        major_name = self._major_cached(text_lower)
         
         if not major_name:
-            return ChatbotResponse(
-                message="Jurusan mana yang ingin Anda ketahui informasinya?",
-                recommendations=[],
-                study_plan=[],
-                confidence=0.3
-            )
+            return _NO_INFO_MAJOR_RESPONSE
         
         # Find major info in KB
-        matching_majors = []
-        for key, data in self.majors_kb.items():
-            if major_name.lower() in data.get('major', '').lower():
-                matching_majors.append(data)
+        major_lower = major_name.lower()
+        matching_majors = [self._kb_prep[i][0] for i in self._kb_rows_containing(major_lower)]
         
         if not matching_majors:
             return ChatbotResponse(
                 message=f"Maaf, saya tidak menemukan informasi untuk jurusan {major_name}. Coba gunakan nama yang lebih spesifik.",
-                recommendations=[],
-                study_plan=[],
+                recommendations=(),
+                study_plan=(),
                 confidence=0.2
             )
         
@@ -896,69 +1439,39 @@ Atau jika masih bingung memilih jurusan, coba ceritakan:
         info_text = f"📋 **Informasi Jurusan {major_name.title()}**:\n\n"
         
         for i, major in enumerate(matching_majors[:5], 1):
-            info_text += f"""**{i}. {major.get('university')} - {major.get('major')}**
-   • Passing Grade: {major.get('passing_grade', 'N/A')}
-   • Rata-rata Rapor: {major.get('required_rapor', 'N/A')}
-   • Tingkat Persaingan: {major.get('competitiveness', 'N/A')}
-   • Daya Tampung: {major.get('capacity', 'N/A')} orang
-   • Acceptance Rate: {major.get('acceptance_rate', 'N/A')}%
-
-"""
+            info_text += _MAJOR_INFO_ITEM_TEMPLATE.format_map({
+                'i': i,
+                'university': major.get('university'),
+                'major': major.get('major'),
+                'passing_grade': major.get('passing_grade', 'N/A'),
+                'required_rapor': major.get('required_rapor', 'N/A'),
+                'competitiveness': major.get('competitiveness', 'N/A'),
+                'capacity': major.get('capacity', 'N/A'),
+                'acceptance_rate': major.get('acceptance_rate', 'N/A'),
+            })
         
         return ChatbotResponse(
             message=info_text,
-            recommendations=matching_majors[:5],
-            study_plan=[],
+            recommendations=tuple(matching_majors[:5]),
+            study_plan=(),
             confidence=0.8
         )
     
-    def _handle_general(self, message: str) -> ChatbotResponse:
+    def _handle_general(self, text_lower: str) -> ChatbotResponse:
         """Handle general queries"""
-        message = """👋 **Halo! Saya chatbot konsultasi pendidikan**
-
-Saya bisa membantu Anda dengan:
-
-🎯 **Rekomendasi Jurusan** berdasarkan nilai rapor
-Contoh: "Nilai matematika 85, fisika 80, kimia 78, rata-rata 82"
-
-📚 **Rencana Belajar** untuk jurusan target
-Contoh: "Saya ingin masuk Teknik Informatika"
-
-💡 **Tips Belajar** untuk persiapan UTBK
-Contoh: "Bagaimana cara belajar matematika yang efektif?"
-
-📊 **Informasi Jurusan** dan passing grade
-Contoh: "Info tentang jurusan Kedokteran"
-
-Silakan tanyakan apa yang ingin Anda ketahui! 😊"""
-        
-        return ChatbotResponse(
-            message=message,
-            recommendations=[],
-            study_plan=[],
-            confidence=0.6
-        )
+        return _GENERAL_RESPONSE
     
     def _extract_major_from_text(self, text: str) -> str:
         """Extract major name from text"""
-        text_lower = text.lower()
-        
-        # Common major keywords with more variations
-        major_keywords = [
-            'teknik informatika', 'informatika', 'kedokteran', 'farmasi', 'hukum',
-            'ekonomi', 'manajemen', 'akuntansi', 'psikologi', 'komunikasi',
-            'teknik sipil', 'teknik mesin', 'teknik elektro', 'arsitektur',
-            'biologi', 'kimia', 'fisika', 'matematika', 'sastra inggris',
-            'hubungan internasional', 'administrasi', 'keperawatan',
-            'teknik industri', 'sistem informasi', 'ilmu komputer',
-            'desain grafis', 'broadcasting', 'jurnalistik', 'perpustakaan',
-            'gizi', 'kesehatan masyarakat', 'kebidanan', 'fisioterapi'
-        ]
-        
-        # Sort by length (longer first) to match more specific terms first
-        major_keywords.sort(key=len, reverse=True)
+        return self._major_cached(self._cache_key(text))
+    
+    def _extract_major_impl(self, text_lower: str) -> str:
+        if self._major_automaton is not None:
+            # One pass; longest keyword wins, earlier MAJOR_KEYWORDS entry on ties
+            best = max((payload for _, _, payload in self._major_automaton.iter(text_lower)), default=None)
+            return best[2] if best else ""
         
-        for keyword in major_keywords:
+        for keyword in _MAJOR_KEYWORDS_SORTED:
             if keyword in text_lower:
                 return keyword
         
@@ -966,137 +1479,66 @@ Silakan tanyakan apa yang ingin Anda ketahui! 😊"""
     
     def _determine_program_from_major(self, major_name: str) -> str:
         """Determine program (saintek/soshum) from major name"""
-        saintek_keywords = ['teknik', 'informatika', 'kedokteran', 'farmasi', 'biologi', 
-                           'kimia', 'fisika', 'matematika', 'arsitektur', 'gizi', 
-                           'kesehatan', 'kebidanan', 'fisioterapi', 'sistem informasi', 
-                           'ilmu komputer']
-        
-        if any(keyword in major_name.lower() for keyword in saintek_keywords):
-            return 'saintek'
-        else:
-            return 'soshum'
+        return _prog_from_major(major_name)
     
     def _format_major_list(self, majors: List[Dict], show_details: bool = False) -> str:
         """Format major list for display"""
         if not majors:
             return "• Tidak ada jurusan dalam kategori ini\n"
         
-        result = ""
+        lines = []
         for major in majors[:5]:  # Limit to 5 per category
+            lines.append(f"• **{major['major']}** ({major['university']}) - Peluang: {major['probability']*100:.1f}%")
             if show_details:
-                result += f"• **{major['major']}** ({major['university']}) - Peluang: {major['probability']*100:.1f}%\n"
                 if major.get('required_rapor'):
-                    result += f"  - Rata-rata Rapor Required: {major['required_rapor']}\n"
+                    lines.append(f"  - Rata-rata Rapor Required: {major['required_rapor']}")
                 if major.get('current_gap'):
                     gap = major['current_gap']
                     if gap > 0:
-                        result += f"  - Gap: +{gap:.1f} (Anda sudah melampaui requirement)\n"
+                        lines.append(f"  - Gap: +{gap:.1f} (Anda sudah melampaui requirement)")
                     else:
-                        result += f"  - Gap: {gap:.1f} (Perlu ditingkatkan)\n"
-            else:
-                result += f"• **{major['major']}** ({major['university']}) - Peluang: {major['probability']*100:.1f}%\n"
+                        lines.append(f"  - Gap: {gap:.1f} (Perlu ditingkatkan)")
         
-        return result
+        return "\n".join(lines) + "\n"
     
     def _format_study_plan(self, study_plan: List[SubjectTopic]) -> str:
         """Format study plan for display"""
-        result = ""
+        blocks = []
         
         for i, subject_plan in enumerate(study_plan, 1):
             difficulty_emoji = '🔥' if subject_plan.difficulty == 'advanced' else '📋' if subject_plan.difficulty == 'intermediate' else '📝'
             
-            result += f"""
+            topics = "".join(f"\n   {j}. {topic}" for j, topic in enumerate(subject_plan.topics, 1))
+            blocks.append(f"""
 **{i}. {subject_plan.subject.replace('_', ' ').title()}** {difficulty_emoji}
-Topik yang harus dikuasai:"""
-            
-            for j, topic in enumerate(subject_plan.topics, 1):
-                result += f"\n   {j}. {topic}"
-            
-            result += "\n"
+Topik yang harus dikuasai:{topics}
+""")
         
-        return result
+        return "".join(blocks)
     
     def _get_major_specific_tips(self, major_name: str, university_name: str = None) -> str:
         """Get major-specific tips and requirements"""
-        major_lower = major_name.lower()
-        tips = []
-        
-        if 'informatika' in major_lower or 'komputer' in major_lower:
-            tips = [
-                "• **Matematika** adalah fondasi utama - kuasai logika, aljabar, dan statistika",
-                "• **Algoritma & Pemrograman** - mulai belajar bahasa pemrograman seperti Python/Java",
-                "• **Logika Berpikir** - latihan soal-soal logika dan problem solving",
-                "• **Bahasa Inggris** - penting untuk membaca dokumentasi teknis",
-                "• **Portofolio** - buat project sederhana untuk menunjukkan kemampuan"
-            ]
-        elif 'kedokteran' in major_lower:
-            tips = [
-                "• **Biologi** - fokus pada anatomi, fisiologi, dan biokimia",
-                "• **Kimia** - kuasai kimia organik dan biokimia",
-                "• **Fisika** - pahami prinsip fisika dalam tubuh manusia",
-                "• **Bahasa Inggris** - untuk membaca jurnal medis internasional",
-                "• **Soft Skills** - empati, komunikasi, dan ketahanan mental"
-            ]
-        elif 'teknik' in major_lower:
-            tips = [
-                "• **Matematika & Fisika** - dasar semua cabang teknik",
-                "• **Problem Solving** - latihan soal-soal aplikatif",
-                "• **Kreativitas** - kemampuan berpikir inovatif",
-                "• **Kerja Tim** - banyak project berbasis kelompok",
-                "• **Update Teknologi** - ikuti perkembangan teknologi terkini"
-            ]
-        elif 'ekonomi' in major_lower or 'manajemen' in major_lower:
-            tips = [
-                "• **Matematika** - statistika, kalkulus, dan matematika bisnis",
-                "• **Bahasa Inggris** - komunikasi bisnis internasional",
-                "• **Analisis** - kemampuan berpikir kritis dan analitis",
-                "• **Leadership** - keterampilan kepemimpinan dan manajemen",
-                "• **Current Issues** - ikuti perkembangan ekonomi dan bisnis"
-            ]
-        elif 'hukum' in major_lower:
-            tips = [
-                "• **Bahasa Indonesia** - kemampuan menulis dan berargumentasi",
-                "• **Sejarah** - memahami sejarah hukum dan konstitusi",
-                "• **Logika** - kemampuan berpikir sistematis dan analitis",
-                "• **Public Speaking** - keterampilan berbicara di depan umum",
-                "• **Reading** - banyak membaca kasus hukum dan perundangan"
-            ]
-        else:
-            tips = [
-                "• **Mata Pelajaran Inti** - fokus pada mapel yang relevan dengan jurusan",
-                "• **Soft Skills** - komunikasi, leadership, dan teamwork",
-                "• **Wawasan Umum** - perbanyak membaca dan update informasi",
-                "• **Pengalaman** - ikuti kegiatan ekstrakurikuler yang relevan",
-                "• **Networking** - bangun relasi dengan senior di bidang yang sama"
-            ]
-        
-        return "\n".join(tips)
+        return _MAJOR_TIPS[_major_tips_category(major_name.lower())]
     
     def _find_related_majors(self, major_name: str, university_name: str = None) -> List[Dict]:
         """Find related majors in the knowledge base"""
         related = []
-        major_lower = major_name.lower()
         
-        for key, major_data in self.majors_kb.items():
+        # Rows whose major contains any word of major_name, kept in KB order
+        rows = sorted(set().union(*(self._kb_rows_containing(word) for word in major_name.lower().split())))
+        
+        # University matches on its full name or any of its aliases
+        uni_needles = None
+        if university_name:
+            uni_lower = university_name.lower()
+            uni_needles = self._university_needles.get(uni_lower, (uni_lower,))
+        
+        for i in rows:
+            major_data, _, kb_university = self._kb_prep[i]
             if not major_data.get('university') or not major_data.get('major'):
                 continue
-                
-            kb_major = major_data.get('major', '').lower()
-            kb_university = major_data.get('university', '').lower()
-            
-            # Check if major matches
-            is_major_match = any(word in kb_major for word in major_lower.split())
             
-            # Check university match if specified
-            is_university_match = True
-            if university_name:
-                uni_lower = university_name.lower()
-                is_university_match = uni_lower in kb_university or any(
-                    alias.lower() in kb_university for alias, full in self.university_aliases.items() 
-                    if full.lower() == uni_lower
-                )
-            
-            if is_major_match and is_university_match:
+            if uni_needles is None or any(needle in kb_university for needle in uni_needles):
                 related.append({
                     'university': major_data.get('university'),
                     'major': major_data.get('major'),
@@ -1106,40 +1548,33 @@ Topik yang harus dikuasai:"""
                     'competitiveness': major_data.get('competitiveness')
                 })
         
-        # Sort by acceptance rate (higher is better) and required rapor (lower is better)
-        related.sort(key=lambda x: (
+        # Top 5 by acceptance rate (higher is better) and required rapor (lower is better)
+        return heapq.nsmallest(5, related, key=lambda x: (
             -(x.get('acceptance_rate') or 0),
             x.get('required_rapor') or 100
         ))
-        
-        return related[:5]  # Return top 5
     
     def _format_related_majors_info(self, related_majors: List[Dict]) -> str:
         """Format related majors information"""
         if not related_majors:
             return "• Informasi detail tidak tersedia dalam database"
         
-        result = ""
-        for i, major in enumerate(related_majors, 1):
-            result += f"""
+        return "".join(
+            f"""
 **{i}. {major['major']} - {major['university']}**
    • Rata-rata Rapor: {major.get('required_rapor', 'N/A')}
    • Passing Grade: {major.get('passing_grade', 'N/A')}
    • Acceptance Rate: {major.get('acceptance_rate', 'N/A')}%
    • Tingkat Persaingan: {major.get('competitiveness', 'N/A')}"""
-        
-        return result
+            for i, major in enumerate(related_majors, 1)
+        )
     
     def _format_grade_breakdown(self, grades: Dict[str, float]) -> str:
         """Format grade breakdown for display"""
-        result = "**Nilai yang Anda berikan:**\n"
-        
-        for subject, grade in grades.items():
-            if subject != 'rata_rata':
-                subject_display = subject.replace('_', ' ').title()
-                result += f"• {subject_display}: {grade}\n"
-        
-        return result
+        return "**Nilai yang Anda berikan:**\n" + "".join(
+            f"• {subject.replace('_', ' ').title()}: {grade}\n"
+            for subject, grade in grades.items() if subject != 'rata_rata'
+        )
     
     def _generate_personalized_guidance(self, grades: Dict[str, float], avg_grade: float, 
                                       very_likely: List[Dict], likely: List[Dict], 
@@ -1159,15 +1594,9 @@ Topik yang harus dikuasai:"""
         else:
             guidance.append("🎯 Fokus perbaiki nilai semester terakhir untuk membuka lebih banyak peluang.")
         
-        # Subject-specific advice
-        if 'matematika' in grades and grades['matematika'] >= 85:
-            guidance.append("• Nilai matematika Anda bagus - cocok untuk jurusan Saintek/Ekonomi")
-        if 'fisika' in grades and grades['fisika'] >= 85:
-            guidance.append("• Nilai fisika tinggi - pertimbangkan jurusan Teknik")
-        if 'biologi' in grades and grades['biologi'] >= 85:
-            guidance.append("• Nilai biologi excellent - Kedokteran/Farmasi bisa jadi pilihan")
-        if 'bahasa_indonesia' in grades and grades['bahasa_indonesia'] >= 85:
-            guidance.append("• Kemampuan bahasa baik - cocok untuk jurusan Soshum")
+        # Subject-specific advice, one mask over the subjects (missing = 0)
+        subject_grades = np.array([grades.get(subject, 0) for subject in STRONG_SUBJECTS], dtype=np.float64)
+        guidance.extend(_STRONG_SUBJECT_ADVICE[i] for i in np.flatnonzero(subject_grades >= STRONG_SUBJECT_GRADE))
         
         # Recommendation-based advice
         if len(very_likely) >= 3:
@@ -0,0 +1,55 @@
+from __future__ import annotations
+import json, pathlib
+from typing import Dict, Optional
+
+# Optional: columnar KB storage (pip install pyarrow)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None  # type: ignore
+
+KEY_COLUMN = "key"  # original majors.json key of each row
+
+def parquet_path_for(json_path) -> pathlib.Path:
+    """Parquet sidecar stored next to the JSON KB."""
+    json_path = pathlib.Path(json_path)
+    return json_path.with_name(json_path.name + ".parquet")
+
+def convert_to_parquet(json_path) -> "pa.Table":
+    """Convert majors.json to its Parquet sidecar and return the table."""
+    with open(json_path, "r", encoding="utf-8") as f:
+        kb = json.load(f)
+    table = pa.Table.from_pylist([{KEY_COLUMN: key, **card} for key, card in kb.items()])
+    try:
+        pq.write_table(table, parquet_path_for(json_path))
+    except Exception as e:  # read-only dir, mixed-type columns
+        print(f"Could not cache majors KB as Parquet: {e}")
+    return table
+
+def load_kb_table(json_path) -> Optional["pa.Table"]:
+    """Majors KB as an Arrow table, memory-mapped from the Parquet sidecar.
+
+    The sidecar is (re)built whenever it is missing or older than the JSON file.
+    Returns None when pyarrow is not installed.
+    """
+    if pq is None:
+        return None
+    parquet_path = parquet_path_for(json_path)
+    try:
+        if parquet_path.stat().st_mtime >= pathlib.Path(json_path).stat().st_mtime:
+            return pq.read_table(parquet_path, memory_map=True)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Ignoring majors KB cache: {e}")
+    return convert_to_parquet(json_path)
+
+def table_to_kb(table: "pa.Table") -> Dict[str, Dict]:
+    """Rebuild the {key: card} dict that majors.json holds."""
+    return {card.pop(KEY_COLUMN): card for card in table.to_pylist()}
+
+if __name__ == "__main__":
+    import sys
+    src = sys.argv[1] if len(sys.argv) > 1 else pathlib.Path(__file__).resolve().parents[1] / "kb" / "majors.json"
+    print(f"Wrote {convert_to_parquet(src).num_rows} rows to {parquet_path_for(src)}")
@@ -1,5 +1,7 @@
 # backend/models/__init__.py
 
+import numpy as np
+
 from .dummy_model import UnimatchDummyModel
 
 # Try to import the enhanced ML model
@@ -14,11 +16,14 @@ except ImportError as e:
     class SNBPPredictor:
         def predict_probability(self, features):
             return 0.5
+        
+        def predict_probability_batch(self, features_list):
+            return np.full(len(features_list), 0.5)
     
     def get_predictor():
         return SNBPPredictor()
     
-    def prepare_prediction_features(request_data):
+    def prepare_prediction_features(request_data, as_record=False):
         return {}
     
     def train_model_if_needed():
@@ -3,124 +3,217 @@ Enhanced ML Model for SNBP prediction using student training data.
 This model learns from historical acceptance data to make better predictions.
 """
 
+import functools
 import json
-import pickle
 import pathlib
+import re
+import threading
+import joblib
+from joblib import Parallel, delayed
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple, Any
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.inspection import permutation_importance
 from sklearn.metrics import classification_report, roc_auc_score, confusion_matrix
 from sklearn.pipeline import Pipeline
 import warnings
 warnings.filterwarnings('ignore')
 
+# Optional: faster JSON parsing of the training data (pip install orjson)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: faster model-file compression (pip install lz4); zlib otherwise
+try:
+    import lz4.frame  # noqa: F401  (registers joblib's 'lz4' compressor)
+    MODEL_COMPRESS = ('lz4', 3)
+except ImportError:
+    MODEL_COMPRESS = ('zlib', 3)
+
+# Optional: JIT for the numeric scoring kernel (pip install numba)
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Optional: ONNX export and inference of the best tree model (pip install skl2onnx onnxruntime)
+try:
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+except ImportError:
+    convert_sklearn = None
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+def _jit(fn):
+    """numba.njit(cache=True, fastmath=True) when numba is installed, else fn unchanged"""
+    return njit(cache=True, fastmath=True)(fn) if njit is not None else fn
+
+@_jit
+def _score_kernel(feat, mean, scale, coef, intercept):
+    """Logistic regression probability of one raw feature vector, scaling fused in"""
+    z = intercept
+    for i in range(feat.shape[0]):
+        z += (feat[i] - mean[i]) / scale[i] * coef[i]
+    return 1.0 / (1.0 + np.exp(-z))
+
+@_jit
+def _heuristic_kernel(rapor_avg, core_avg, program_match):
+    """Heuristic acceptance probability from the averages and program match"""
+    # Normalize to 0-100 scale, penalize a program mismatch, then sigmoid
+    normalized_score = max(0.0, min(100.0, (rapor_avg + core_avg) / 2))
+    if program_match == 0:
+        normalized_score *= 0.8
+    return 1.0 / (1.0 + np.exp(-0.1 * (normalized_score - 75.0)))
+
 ROOT = pathlib.Path(__file__).resolve().parent
 STUDENT_DATA_PATH = ROOT / "data" / "processed_student_data.json"
 STATISTICS_PATH = ROOT / "data" / "student_statistics.json"
 MODEL_PATH = ROOT / "models" / "snbp_model.pkl"
+BEST_MODEL_PATH = ROOT / "models" / "snbp_best.pkl"  # best model only, uncompressed for mmap
 SCALER_PATH = ROOT / "models" / "feature_scaler.pkl"
 ENCODERS_PATH = ROOT / "models" / "label_encoders.pkl"
+ONNX_MODEL_PATH = BEST_MODEL_PATH.with_suffix(".onnx")  # best tree model, for onnxruntime
+
+# Bump when the saved model layout or feature set changes; older files are retrained
+MODEL_VERSION = "3"
+
+# Model feature columns, in the sorted order prepare_features uses
+FEATURE_NAMES = tuple(sorted([
+    'rapor_avg', 'core_avg', 'program_avg', 'math_score', 'language_score',
+    'program_saintek', 'program_soshum', 'program_match',
+    'physics_score', 'chemistry_score', 'biology_score',
+    'economics_score', 'geography_score', 'history_score',
+]))
+FEATURE_INDEX = {fname: i for i, fname in enumerate(FEATURE_NAMES)}
+
+# Packed record form of a feature vector; a (N,) array of these views as an (N, F) float32 matrix
+FEATURE_DTYPE = np.dtype([(fname, 'f4') for fname in FEATURE_NAMES])
+
+# Features lowered (floored at 60) in synthetic negatives; subject scores only when present (> 0)
+NEGATIVE_GRADE_FEATURES = ('rapor_avg', 'core_avg', 'program_avg', 'math_score', 'language_score')
+NEGATIVE_SUBJECT_FEATURES = ('physics_score', 'chemistry_score', 'biology_score',
+                             'economics_score', 'geography_score', 'history_score')
+
+# Target-major keywords that mark a program mismatch (substring match on the uppercased major)
+SAINTEK_MISMATCH_RE = re.compile('EKONOMI|HUKUM|KOMUNIKASI|SASTRA')
+SOSHUM_MISMATCH_RE = re.compile('TEKNIK|KEDOKTERAN|FARMASI')
 
 # Ensure models directory exists
 MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+@functools.lru_cache(maxsize=None)
+def _file_exists(path: pathlib.Path) -> bool:
+    """Path.exists() checked once per process; cleared when the models are saved"""
+    return path.exists()
+
+def _read_json(path: pathlib.Path) -> Any:
+    """Parse a JSON file, with orjson when installed"""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 class SNBPPredictor:
     """Enhanced SNBP Prediction Model"""
     
     def __init__(self):
         self.models = {}
-        self.scaler = StandardScaler()
+        self.scaler = StandardScaler(copy=False, with_mean=True, with_std=True)
         self.label_encoders = {}
-        self.feature_stats = {}
+        self._feature_stats = None  # loaded from STATISTICS_PATH on first use
         self.is_trained = False
-        
+        self._scratch = threading.local()  # per-thread (1, F) feature buffer for predict_probability
+        self._onnx_session = None  # onnxruntime session for the best model, when exported
+        self.feature_importances = {}  # model name -> permutation importances on the test split
+        
+    @property
+    def feature_stats(self) -> Dict[str, Any]:
+        """Feature statistics from prepare_student_data; not needed for prediction, so read lazily"""
+        if self._feature_stats is None:
+            try:
+                self._feature_stats = _read_json(STATISTICS_PATH)
+            except (OSError, ValueError) as e:
+                print(f"Feature statistics not available: {e}")
+                self._feature_stats = {}
+        return self._feature_stats
+    
+    @feature_stats.setter
+    def feature_stats(self, value: Dict[str, Any]):
+        self._feature_stats = value
+    
     def load_training_data(self):
         """Load processed student training data"""
         if not STUDENT_DATA_PATH.exists():
             raise FileNotFoundError(f"Training data not found: {STUDENT_DATA_PATH}")
             
-        with open(STUDENT_DATA_PATH, 'r', encoding='utf-8') as f:
-            student_data = json.load(f)
-            
-        with open(STATISTICS_PATH, 'r', encoding='utf-8') as f:
-            self.feature_stats = json.load(f)
+        student_data = _read_json(STUDENT_DATA_PATH)
+        self.feature_stats = _read_json(STATISTICS_PATH)
             
         return student_data
     
     def prepare_features(self, student_data: List[Dict]) -> Tuple[np.ndarray, np.ndarray, List[str]]:
         """Prepare feature matrix and labels for training"""
-        features_list = []
-        labels = []
-        feature_names = None
+        # One reindex in pandas instead of a dict lookup per student and feature;
+        # float32 halves the matrix the models train on
+        df = pd.DataFrame.from_records([student['features'] for student in student_data])
+        feature_names = sorted(df.columns)
+        X = df.reindex(columns=feature_names, fill_value=0).fillna(0).to_numpy(dtype=np.float32)
         
-        for student in student_data:
-            features = student['features']
-            
-            # Ensure consistent feature ordering
-            if feature_names is None:
-                feature_names = sorted(features.keys())
-            
-            # Create feature vector
-            feature_vector = [features.get(fname, 0) for fname in feature_names]
-            features_list.append(feature_vector)
-            
-            # Label is always 1 (accepted) for training data
-            labels.append(1)
-        
-        X = np.array(features_list)
-        y = np.array(labels)
+        # Accepted students are 1, synthetic negatives carry target 0
+        y = np.fromiter((student.get('target', 1) for student in student_data), dtype=np.int8, count=len(student_data))
         
         return X, y, feature_names
     
     def generate_negative_samples(self, student_data: List[Dict], ratio: float = 0.3) -> List[Dict]:
         """Generate synthetic negative samples (rejected students)"""
-        negative_samples = []
         n_negatives = int(len(student_data) * ratio)
+        if n_negatives <= 0:
+            return []
         
-        # Strategy: Lower grades + mismatched programs
-        for i in range(n_negatives):
-            # Pick a random positive sample as template
-            template = np.random.choice(student_data)
-            
-            # Create degraded version
-            negative_sample = template.copy()
-            features = negative_sample['features'].copy()
-            
-            # Reduce academic scores by 5-15 points
-            grade_reduction = np.random.uniform(5, 15)
-            features['rapor_avg'] = max(60, features['rapor_avg'] - grade_reduction)
-            features['core_avg'] = max(60, features['core_avg'] - grade_reduction)
-            features['program_avg'] = max(60, features['program_avg'] - grade_reduction)
-            features['math_score'] = max(60, features['math_score'] - grade_reduction)
-            features['language_score'] = max(60, features['language_score'] - grade_reduction)
-            
-            # Sometimes flip program compatibility
-            if np.random.random() < 0.4:
+        # Strategy: Lower grades + mismatched programs, all random draws made up front
+        template_idx = np.random.randint(0, len(student_data), n_negatives)
+        grade_reduction = np.random.uniform(5, 15, n_negatives)[:, None]  # 5-15 points per sample
+        flip_match = np.random.random(n_negatives) < 0.4  # Sometimes flip program compatibility
+        
+        templates = [student_data[i] for i in template_idx]
+        grades = np.array([[t['features'][f] for f in NEGATIVE_GRADE_FEATURES] for t in templates], dtype=np.float64)
+        subjects = np.array([[t['features'].get(f, 0) for f in NEGATIVE_SUBJECT_FEATURES] for t in templates], dtype=np.float64)
+        
+        grades = np.maximum(60, grades - grade_reduction)
+        has_subject = subjects > 0
+        subjects = np.maximum(60, subjects - grade_reduction)
+        
+        negative_samples = []
+        for i, (template, grade_row, subject_row, subject_mask, flip) in enumerate(zip(
+                templates, grades.tolist(), subjects.tolist(), has_subject.tolist(), flip_match.tolist())):
+            features = template['features'].copy()
+            features.update(zip(NEGATIVE_GRADE_FEATURES, grade_row))
+            for fname, value, present in zip(NEGATIVE_SUBJECT_FEATURES, subject_row, subject_mask):
+                if present:
+                    features[fname] = value
+            if flip:
                 features['program_match'] = 0
-                
-            # Reduce subject-specific scores
-            for subject in ['physics_score', 'chemistry_score', 'biology_score', 
-                          'economics_score', 'geography_score', 'history_score']:
-                if features.get(subject, 0) > 0:
-                    features[subject] = max(60, features[subject] - grade_reduction)
             
-            negative_sample['features'] = features
-            negative_sample['target'] = 0  # Rejected
-            negative_sample['student_id'] = f"neg_{i}"
-            
-            negative_samples.append(negative_sample)
+            # Training only reads features/target; skip the template's averages, subjects, labels
+            negative_samples.append({'student_id': f"neg_{i}", 'features': features, 'target': 0})
         
         return negative_samples
     
     def train_models(self, force_retrain: bool = False):
         """Train multiple ML models"""
         
-        # Check if models already exist
-        if not force_retrain and self.load_trained_models():
+        # Reuse saved models unless the training data was regenerated after they were saved
+        if not force_retrain and self._models_up_to_date() and self.load_trained_models():
             print("Loaded existing trained models")
             return
         
@@ -148,9 +241,9 @@ class SNBPPredictor:
             X, y, test_size=0.2, random_state=42, stratify=y
         )
         
-        # Scale features
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
+        # Scale float32 copies in place; the tree models train on the raw split
+        X_train_scaled = self.scaler.fit_transform(X_train.copy())
+        X_test_scaled = self.scaler.transform(X_test.copy())
         
         # Train multiple models
         models_config = {
@@ -160,13 +253,16 @@ class SNBPPredictor:
                 random_state=42,
                 class_weight='balanced'
             ),
-            'gradient_boosting': GradientBoostingClassifier(
-                n_estimators=100,
+            # Histogram-based: binned features, much faster fit/predict and smaller on disk
+            'gradient_boosting': HistGradientBoostingClassifier(
+                max_iter=200,
                 learning_rate=0.1,
                 max_depth=6,
+                early_stopping=True,
                 random_state=42
             ),
             'logistic_regression': LogisticRegression(
+                solver='liblinear',
                 random_state=42,
                 class_weight='balanced',
                 max_iter=1000
@@ -177,26 +273,23 @@ class SNBPPredictor:
         best_score = 0
         
         print("\nTraining and evaluating models:")
-        for name, model in models_config.items():
-            # Train model
-            if name == 'logistic_regression':
-                model.fit(X_train_scaled, y_train)
-                y_pred = model.predict(X_test_scaled)
-                y_prob = model.predict_proba(X_test_scaled)[:, 1]
-            else:
-                model.fit(X_train, y_train)
-                y_pred = model.predict(X_test)
-                y_prob = model.predict_proba(X_test)[:, 1]
-            
-            # Evaluate
-            auc_score = roc_auc_score(y_test, y_prob)
-            
+        # Independent fits that release the GIL in native code: run them concurrently,
+        # then report in config order
+        results = Parallel(n_jobs=len(models_config), backend='threading')(
+            delayed(_fit_one)(name, model, (X_train, y_train, X_test, y_test),
+                              (X_train_scaled, y_train, X_test_scaled, y_test))
+            for name, model in models_config.items()
+        )
+        
+        self.feature_importances = {}
+        for name, model, y_pred, auc_score, importances in results:
             print(f"\n{name.upper()}:")
             print(f"AUC Score: {auc_score:.4f}")
             print(classification_report(y_test, y_pred, target_names=['Rejected', 'Accepted']))
             
             # Save model
             self.models[name] = model
+            self.feature_importances[name] = dict(zip(feature_names, importances))
             
             # Track best model
             if auc_score > best_score:
@@ -205,72 +298,207 @@ class SNBPPredictor:
         
         print(f"\nBest model: {best_model} (AUC: {best_score:.4f})")
         self.best_model_name = best_model
-        self.feature_names = feature_names
+        self._set_feature_names(feature_names)
         self.is_trained = True
         
         # Save models
         self.save_trained_models()
+        self._onnx_session = self._load_onnx_session()
         
+    @staticmethod
+    def _models_up_to_date() -> bool:
+        """Saved models are at least as new as the training data (or the data is gone)"""
+        try:
+            model_mtime = MODEL_PATH.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        try:
+            return model_mtime >= STUDENT_DATA_PATH.stat().st_mtime
+        except FileNotFoundError:
+            return True
+    
     def save_trained_models(self):
         """Save trained models to disk"""
         model_data = {
+            'version': MODEL_VERSION,
             'models': self.models,
             'scaler': self.scaler,
             'feature_names': self.feature_names,
             'best_model_name': self.best_model_name,
-            'feature_stats': self.feature_stats
+            'feature_importances': self.feature_importances
         }
         
-        with open(MODEL_PATH, 'wb') as f:
-            pickle.dump(model_data, f)
+        # Full ensemble (retraining/analysis), compressed
+        joblib.dump(model_data, MODEL_PATH, compress=MODEL_COMPRESS)
+        
+        # What inference needs: the best model alone, uncompressed so it can be memory-mapped
+        best_data = {**model_data, 'models': {self.best_model_name: self.models[self.best_model_name]}}
+        joblib.dump(best_data, BEST_MODEL_PATH)
+        self._export_onnx()
+        _file_exists.cache_clear()
         
-        print(f"Models saved to: {MODEL_PATH}")
+        print(f"Models saved to: {MODEL_PATH} (best model: {BEST_MODEL_PATH})")
     
-    def load_trained_models(self) -> bool:
-        """Load trained models from disk"""
-        if not MODEL_PATH.exists():
-            return False
-            
-        try:
-            with open(MODEL_PATH, 'rb') as f:
-                model_data = pickle.load(f)
+    def load_trained_models(self, all_models: bool = False) -> bool:
+        """Load trained models from disk (only the best one unless all_models)"""
+        paths = (MODEL_PATH,) if all_models else (BEST_MODEL_PATH, MODEL_PATH)
+        for path in paths:
+            model_data = self._read_model_file(path)
+            if model_data is None:
+                continue
             
             self.models = model_data['models']
             self.scaler = model_data['scaler']
-            self.feature_names = model_data['feature_names']
+            self._set_feature_names(model_data['feature_names'])
             self.best_model_name = model_data['best_model_name']
-            self.feature_stats = model_data.get('feature_stats', {})
+            self.feature_importances = model_data['feature_importances']
+            self._onnx_session = self._load_onnx_session()
             self.is_trained = True
             
             return True
+        return False
+    
+    def _export_onnx(self):
+        """Write the best model to ONNX_MODEL_PATH (tree models only; LR has its own kernel)"""
+        ONNX_MODEL_PATH.unlink(missing_ok=True)
+        if convert_sklearn is None or self.best_model_name == 'logistic_regression':
+            return
+        
+        best_model = self.models[self.best_model_name]
+        try:
+            onx = convert_sklearn(
+                best_model,
+                initial_types=[('X', FloatTensorType([None, len(self.feature_names)]))],
+                options={id(best_model): {'zipmap': False}},  # plain (N, 2) probability tensor
+            )
+        except Exception as e:
+            print(f"Could not export {self.best_model_name} to ONNX: {e}")
+            return
+        
+        # Tag the file so a model saved later by a build without skl2onnx is not shadowed
+        for key, value in (('version', MODEL_VERSION), ('best_model_name', self.best_model_name)):
+            onx.metadata_props.add(key=key, value=value)
+        ONNX_MODEL_PATH.write_bytes(onx.SerializeToString())
+    
+    def _load_onnx_session(self):
+        """onnxruntime session for the loaded best model, or None to predict with sklearn"""
+        if ort is None or not _file_exists(ONNX_MODEL_PATH):
+            return None
+        
+        try:
+            session = ort.InferenceSession(str(ONNX_MODEL_PATH), providers=['CPUExecutionProvider'])
+        except Exception as e:
+            print(f"Error loading ONNX model: {e}")
+            return None
+        
+        meta = session.get_modelmeta().custom_metadata_map
+        if meta.get('version') != MODEL_VERSION or meta.get('best_model_name') != self.best_model_name:
+            return None
+        return session
+    
+    def _set_feature_names(self, feature_names):
+        """Freeze the model's feature order and the (index, name) slots used to fill vectors"""
+        self.feature_names = tuple(feature_names)
+        self._feature_slots = tuple(enumerate(self.feature_names))
+    
+    def _feature_buffer(self) -> np.ndarray:
+        """This thread's reusable (1, F) float32 feature row"""
+        buf = getattr(self._scratch, 'X', None)
+        if buf is None or buf.shape[1] != len(self._feature_slots):
+            buf = self._scratch.X = np.empty((1, len(self._feature_slots)), dtype=np.float32)
+        return buf
+    
+    @staticmethod
+    def _read_model_file(path: pathlib.Path) -> Optional[Dict[str, Any]]:
+        """Contents of a saved model file, or None if missing, unreadable or stale"""
+        if not _file_exists(path):
+            return None
+        
+        try:
+            # Uncompressed files are memory-mapped: tree/coefficient arrays are paged in on demand
+            model_data = joblib.load(path, mmap_mode='r')
         except Exception as e:
             print(f"Error loading models: {e}")
-            return False
+            return None
+        
+        if model_data.get('version') != MODEL_VERSION:
+            print(f"Ignoring stale model file {path.name} (version {model_data.get('version')!r}, expected {MODEL_VERSION!r})")
+            return None
+        return model_data
     
     def predict_probability(self, features: Dict[str, Any]) -> float:
-        """Predict acceptance probability for a student"""
+        """Predict acceptance probability for a student (feature dict or FEATURE_DTYPE record)"""
+        if isinstance(features, np.ndarray):
+            return float(self.predict_batch(self.feature_matrix(features))[0])
+        
         if not self.is_trained:
             if not self.load_trained_models():
                 # Fallback to heuristic if no trained model
                 return self._heuristic_prediction(features)
         
-        # Prepare feature vector
-        feature_vector = []
-        for fname in self.feature_names:
-            feature_vector.append(features.get(fname, 0))
-        
-        X = np.array([feature_vector])
+        # Prepare feature vector in this thread's scratch buffer, no per-call allocation
+        X = self._feature_buffer()
+        feature_vector = X[0]
+        for i, fname in self._feature_slots:
+            feature_vector[i] = features.get(fname, 0)
         
         # Get prediction from best model
         best_model = self.models[self.best_model_name]
         
         if self.best_model_name == 'logistic_regression':
-            X = self.scaler.transform(X)
+            # Scaling + linear model + sigmoid in one kernel call
+            return float(_score_kernel(
+                feature_vector, self.scaler.mean_, self.scaler.scale_,
+                best_model.coef_[0], float(best_model.intercept_[0])
+            ))
+        
+        if self._onnx_session is not None:
+            return float(self._onnx_session.run(['probabilities'], {'X': X})[0][0, 1])
         
         probability = best_model.predict_proba(X)[0, 1]
         
         return float(probability)
     
+    def predict_probability_batch(self, features_list: List[Dict[str, Any]]) -> np.ndarray:
+        """predict_probability for many students with a single model call"""
+        if not self.is_trained:
+            self.load_trained_models()
+        return self.predict_batch(self.feature_matrix(features_list))
+    
+    def feature_matrix(self, features_list: List[Dict[str, Any]]) -> np.ndarray:
+        """Stack feature dicts (or view FEATURE_DTYPE records) into the (N, F) matrix predict_batch expects"""
+        names = getattr(self, 'feature_names', None) or FEATURE_NAMES
+        if isinstance(features_list, np.ndarray) and features_list.dtype == FEATURE_DTYPE:
+            X = np.ascontiguousarray(features_list).reshape(-1).view(np.float32).reshape(-1, len(FEATURE_NAMES))
+            return X if names == FEATURE_NAMES else X[:, [FEATURE_INDEX[fname] for fname in names]]
+        return np.array([[features.get(fname, 0) for fname in names] for features in features_list], dtype=np.float32)
+    
+    def predict_batch(self, X: np.ndarray) -> np.ndarray:
+        """Predict acceptance probabilities for every row of an (N, F) feature matrix"""
+        X = np.asarray(X, dtype=np.float32)
+        if not self.is_trained:
+            if not self.load_trained_models():
+                return self._heuristic_batch(X)
+        
+        best_model = self.models[self.best_model_name]
+        
+        if self.best_model_name == 'logistic_regression':
+            z = ((X - self.scaler.mean_) / self.scaler.scale_) @ best_model.coef_[0] + best_model.intercept_[0]
+            return 1 / (1 + np.exp(-z))
+        
+        if self._onnx_session is not None:
+            return self._onnx_session.run(['probabilities'], {'X': X})[0][:, 1]
+        
+        return best_model.predict_proba(X)[:, 1]
+    
+    def _heuristic_batch(self, X: np.ndarray) -> np.ndarray:
+        """Vectorized _heuristic_prediction over the rows of X (columns in FEATURE_NAMES order)"""
+        col = FEATURE_INDEX
+        base_score = (X[:, col['rapor_avg']] + X[:, col['core_avg']]) / 2
+        normalized_score = np.clip(base_score, 0, 100)
+        normalized_score = np.where(X[:, col['program_match']] == 0, normalized_score * 0.8, normalized_score)
+        return 1 / (1 + np.exp(-0.1 * (normalized_score - 75)))
+    
     def _heuristic_prediction(self, features: Dict[str, Any]) -> float:
         """Fallback heuristic prediction if no trained model available"""
         rapor_avg = features.get('rapor_avg', 75)
@@ -278,41 +506,28 @@ class SNBPPredictor:
         program_match = features.get('program_match', 1)
         
         # Simple heuristic based on grades and program match
-        base_score = (rapor_avg + core_avg) / 2
-        
-        # Normalize to 0-100 scale
-        normalized_score = max(0, min(100, base_score))
-        
-        # Apply program match penalty
-        if program_match == 0:
-            normalized_score *= 0.8
-        
-        # Convert to probability using sigmoid
-        probability = 1 / (1 + np.exp(-0.1 * (normalized_score - 75)))
-        
-        return float(probability)
+        return float(_heuristic_kernel(float(rapor_avg), float(core_avg), float(program_match)))
     
     def get_feature_importance(self, model_name: str = None) -> Dict[str, float]:
-        """Get feature importance from trained models"""
+        """Get permutation feature importance (computed at train time) for a trained model"""
         if not self.is_trained:
             return {}
             
         model_name = model_name or self.best_model_name
-        model = self.models.get(model_name)
-        
-        if not model or not hasattr(model, 'feature_importances_'):
-            return {}
-        
-        importance_dict = {}
-        for i, importance in enumerate(model.feature_importances_):
-            feature_name = self.feature_names[i]
-            importance_dict[feature_name] = float(importance)
+        importance_dict = self.feature_importances.get(model_name, {})
         
         # Sort by importance
         return dict(sorted(importance_dict.items(), key=lambda x: x[1], reverse=True))
 
-def prepare_prediction_features(request_data: Dict) -> Dict[str, Any]:
-    """Convert API request data to ML model features"""
+def feature_record(features: Dict[str, Any]) -> np.ndarray:
+    """Pack a feature dict into a length-1 FEATURE_DTYPE record (missing features are 0)"""
+    record = np.zeros(1, dtype=FEATURE_DTYPE)
+    for fname in FEATURE_NAMES:
+        record[fname] = features.get(fname, 0)
+    return record
+
+def prepare_prediction_features(request_data: Dict, as_record: bool = False) -> Dict[str, Any]:
+    """Convert API request data to ML model features (a FEATURE_DTYPE record if as_record)"""
     # Extract grades
     grades = [request_data.get(f's{i}') for i in range(1, 6)]
     valid_grades = [g for g in grades if g is not None]
@@ -364,9 +579,9 @@ def prepare_prediction_features(request_data: Dict) -> Dict[str, Any]:
     # Program compatibility (simplified heuristic)
     target_major = request_data.get('target_major', '').upper()
     program_match = 1
-    if program == 'saintek' and any(keyword in target_major for keyword in ['EKONOMI', 'HUKUM', 'KOMUNIKASI', 'SASTRA']):
+    if program == 'saintek' and SAINTEK_MISMATCH_RE.search(target_major):
         program_match = 0
-    elif program == 'soshum' and any(keyword in target_major for keyword in ['TEKNIK', 'KEDOKTERAN', 'FARMASI']):
+    elif program == 'soshum' and SOSHUM_MISMATCH_RE.search(target_major):
         program_match = 0
     
     features = {
@@ -386,7 +601,25 @@ def prepare_prediction_features(request_data: Dict) -> Dict[str, Any]:
         'history_score': history_score,
     }
     
-    return features
+    return feature_record(features) if as_record else features
+
+# Canned student for warming up the prediction path
+WARMUP_FEATURES = {
+    'rapor_avg': 85.0,
+    'core_avg': 87.0,
+    'program_avg': 86.0,
+    'math_score': 88.0,
+    'language_score': 85.0,
+    'program_saintek': 1,
+    'program_soshum': 0,
+    'program_match': 1,
+    'physics_score': 85.0,
+    'chemistry_score': 84.0,
+    'biology_score': 86.0,
+    'economics_score': 0,
+    'geography_score': 0,
+    'history_score': 0,
+}
 
 # Global predictor instance
 _predictor = None
@@ -396,11 +629,41 @@ def get_predictor() -> SNBPPredictor:
     global _predictor
     if _predictor is None:
         _predictor = SNBPPredictor()
+        _warmup_predictor(_predictor)
     return _predictor
 
+def _warmup_predictor(predictor: SNBPPredictor):
+    """Load the model and run one prediction so the first request doesn't pay for it"""
+    _warmup_kernels()
+    try:
+        predictor.predict_probability(WARMUP_FEATURES)
+    except Exception as e:
+        print(f"Predictor warmup failed: {e}")
+
+def _fit_one(name, model, raw_split, scaled_split):
+    """Fit one candidate model and evaluate it; logistic regression uses the scaled split.
+    
+    Also measures permutation importance (AUC drop) on the test split, which works for
+    every model type, unlike feature_importances_ (HistGradientBoosting has none).
+    """
+    X_train, y_train, X_test, y_test = scaled_split if name == 'logistic_regression' else raw_split
+    model.fit(X_train, y_train)
+    y_pred = model.predict(X_test)
+    y_prob = model.predict_proba(X_test)[:, 1]
+    importances = permutation_importance(model, X_test, y_test, scoring='roc_auc',
+                                         n_repeats=5, random_state=42).importances_mean
+    return name, model, y_pred, roc_auc_score(y_test, y_prob), importances.tolist()
+
+def _warmup_kernels():
+    """Compile the JIT kernels now so the first request doesn't pay for it"""
+    ones = np.ones(1, dtype=np.float64)
+    _score_kernel(np.ones(1, dtype=np.float32), np.zeros(1, dtype=np.float64), ones, ones, 0.0)
+    _heuristic_kernel(75.0, 75.0, 1.0)
+
 def train_model_if_needed():
     """Train model if training data is available"""
-    if STUDENT_DATA_PATH.exists():
+    _warmup_kernels()
+    if _file_exists(STUDENT_DATA_PATH):
         predictor = get_predictor()
         predictor.train_models(force_retrain=False)
         return True
@@ -412,22 +675,7 @@ if __name__ == "__main__":
     predictor.train_models(force_retrain=True)
     
     # Test prediction
-    test_features = {
-        'rapor_avg': 85.0,
-        'core_avg': 87.0,
-        'program_avg': 86.0,
-        'math_score': 88.0,
-        'language_score': 85.0,
-        'program_saintek': 1,
-        'program_soshum': 0,
-        'program_match': 1,
-        'physics_score': 85.0,
-        'chemistry_score': 84.0,
-        'biology_score': 86.0,
-        'economics_score': 0,
-        'geography_score': 0,
-        'history_score': 0,
-    }
+    test_features = WARMUP_FEATURES
     
     probability = predictor.predict_probability(test_features)
     print(f"\nTest prediction: {probability:.3f}")
@@ -7,12 +7,20 @@ Output:
 - data/student_statistics.json (for feature distributions)
 """
 
+import itertools
 import json
+from collections import Counter
 import pathlib
 import numpy as np
+import openpyxl
 import pandas as pd
 from typing import Dict, List, Optional, Tuple
 
+try:
+    import orjson  # pip install orjson
+except ImportError:
+    orjson = None
+
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 SRC = ROOT / "data" / "dummy_data_SNDP_2025.xlsx"
 OUT_DATA = ROOT / "data" / "processed_student_data.json"
@@ -21,185 +29,307 @@ OUT_STATS = ROOT / "data" / "student_statistics.json"
 # Ensure output directory exists
 OUT_DATA.parent.mkdir(parents=True, exist_ok=True)
 
-def clean_text(text):
-    """Clean and standardize text data"""
-    if pd.isna(text) or text is None:
-        return None
-    return str(text).strip().upper()
+# Column names based on our analysis: 20 subject grades, then the label columns
+SUBJECT_COLUMNS = [
+    'agama', 'ppkn', 'bahasa_indonesia', 'bahasa_inggris', 'matematika_wajib',
+    'seni_budaya', 'pjok', 'prakarya', 'matematika_peminatan', 'fisika',
+    'kimia', 'biologi', 'geografi', 'sejarah', 'sosiologi', 'ekonomi',
+    'sastra_indonesia', 'sastra_inggris', 'bahasa_asing', 'antropologi'
+]
+COLUMN_NAMES = SUBJECT_COLUMNS + ['program', 'major', 'university', 'category']
 
-def calculate_subject_averages(row):
-    """Calculate various subject averages for a student"""
-    # Subject mapping based on the Excel columns
-    subjects = {
-        'agama': row[0],
-        'ppkn': row[1], 
-        'bahasa_indonesia': row[2],
-        'bahasa_inggris': row[3],
-        'matematika_wajib': row[4],
-        'seni_budaya': row[5],
-        'pjok': row[6],
-        'prakarya': row[7],
-        'matematika_peminatan': row[8],
-        'fisika': row[9],
-        'kimia': row[10],
-        'biologi': row[11],
-        'geografi': row[12],
-        'sejarah': row[13],
-        'sosiologi': row[14],
-        'ekonomi': row[15],
-        'sastra_indonesia': row[16],
-        'sastra_inggris': row[17],
-        'bahasa_asing': row[18],
-        'antropologi': row[19]
-    }
+CORE_SUBJECTS = ['matematika_wajib', 'bahasa_indonesia', 'bahasa_inggris']
+SAINTEK_SUBJECTS = ['matematika_wajib', 'matematika_peminatan', 'fisika', 'kimia', 'biologi', 'bahasa_indonesia', 'bahasa_inggris']
+SOSHUM_SUBJECTS = ['matematika_wajib', 'bahasa_indonesia', 'bahasa_inggris', 'geografi', 'sejarah', 'sosiologi', 'ekonomi']
+
+# Sheet rows processed per vectorized batch while streaming
+CHUNK_ROWS = 2_000
+
+# SOSUM majors that still need an IPA background
+IPA_MAJOR_PATTERN = 'TEKNIK|INFORMATIKA|KEDOKTERAN|FARMASI|BIOLOGI'
+
+def iter_sheet_chunks(path, chunk_rows: int = CHUNK_ROWS):
+    """Stream the first sheet as DataFrames of up to chunk_rows rows.
+
+    Columns are named from COLUMN_NAMES and the index is the sheet row number
+    (0 = first row after the header), like pd.read_excel would give.
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        width = len(header)
+        columns = COLUMN_NAMES[:width]
+        start = 0
+        while True:
+            chunk = [row[:width] + (None,) * (width - len(row)) for row in itertools.islice(rows, chunk_rows)]
+            if not chunk:
+                break
+            yield pd.DataFrame(chunk, columns=columns, index=range(start, start + len(chunk)))
+            start += len(chunk)
+    finally:
+        workbook.close()
+
+def process_chunk(df: pd.DataFrame) -> Tuple[List[Dict], int]:
+    """Processed records for one batch of sheet rows, and how many rows were skipped"""
+    for name in ('program', 'major', 'university', 'category'):
+        if name not in df:
+            df[name] = None
+    
+    # Skip rows without major/university info
+    keep = df['major'].notna() & df['university'].notna()
+    skipped_rows = int((~keep).sum())
+    df = df[keep]
+    
+    # Clean text fields
+    program = clean_text_column(df['program'])
+    major = clean_text_column(df['major'])
+    university = clean_text_column(df['university'])
+    category = clean_text_column(df['category'])
+    
+    # Averages and program compatibility for all students in column operations
+    grades = numeric_grades(df)
+    stats = calculate_subject_averages(grades, program)
+    program_match = determine_program_compatibility(program, major, category)
+    
+    return build_records(df, grades, stats, program, major, university, category, program_match), skipped_rows
+
+def json_bytes(obj, indent: bool = False) -> bytes:
+    """UTF-8 JSON for obj, via orjson when installed (compact unless indent)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0))
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+class JsonArrayWriter:
+    """Write a compact JSON array one element at a time"""
+    
+    def __init__(self, path):
+        self.f = open(path, 'wb')
+        self.count = 0
+    
+    def write(self, item):
+        self.f.write((b'[' if self.count == 0 else b',') + json_bytes(item))
+        self.count += 1
+    
+    def close(self):
+        self.f.write(b']' if self.count else b'[]')
+        self.f.close()
     
-    # Remove None values
-    valid_subjects = {k: v for k, v in subjects.items() if pd.notna(v) and isinstance(v, (int, float))}
+    def __enter__(self):
+        return self
     
-    # Calculate different averages
-    averages = {}
+    def __exit__(self, *exc):
+        self.close()
+
+def clean_text_column(column: pd.Series) -> pd.Series:
+    """Clean and standardize a text column (missing values become None)"""
+    cleaned = column.astype(str).str.strip().str.upper().astype(object)
+    return cleaned.where(column.notna(), None)
+
+def numeric_grades(df: pd.DataFrame) -> np.ndarray:
+    """(N, 20) float matrix of subject grades; missing or non-numeric cells are NaN"""
+    columns = []
+    for name in SUBJECT_COLUMNS:
+        column = df[name] if name in df else pd.Series(np.nan, index=df.index)
+        if not pd.api.types.is_numeric_dtype(column):
+            column = column.where(column.map(lambda v: isinstance(v, (int, float))))
+        columns.append(column.astype(np.float64).to_numpy())
+    return np.column_stack(columns)
+
+def row_means(values: np.ndarray, mask: np.ndarray, fallback: np.ndarray) -> np.ndarray:
+    """Mean of the masked values of each row, or fallback for rows with none.
+
+    Rows are grouped by mask pattern so each group averages a dense block,
+    which sums in the same order as np.mean over that row's values.
+    """
+    result = np.array(fallback, dtype=np.float64)
+    patterns, inverse = np.unique(mask, axis=0, return_inverse=True)
+    for k, pattern in enumerate(patterns):
+        columns = np.flatnonzero(pattern)
+        if columns.size:
+            rows = np.flatnonzero(inverse.reshape(-1) == k)
+            result[rows] = values[np.ix_(rows, columns)].mean(axis=1)
+    return result
+
+def calculate_subject_averages(grades: np.ndarray, program: pd.Series) -> Dict[str, np.ndarray]:
+    """Calculate various subject averages for every student at once"""
+    col = {name: i for i, name in enumerate(SUBJECT_COLUMNS)}
+    valid = ~np.isnan(grades)
+    present = valid & (grades != 0)  # subjects that count towards core/program averages
     
     # Overall average (all subjects)
-    if valid_subjects:
-        averages['rapor_avg'] = np.mean(list(valid_subjects.values()))
-    else:
-        averages['rapor_avg'] = 0.0
-        
+    rapor_avg = row_means(grades, valid, np.zeros(len(grades)))
+    
     # Core subjects for all programs
-    core_subjects = ['matematika_wajib', 'bahasa_indonesia', 'bahasa_inggris']
-    core_values = [valid_subjects.get(subj) for subj in core_subjects if valid_subjects.get(subj)]
-    averages['core_avg'] = np.mean(core_values) if core_values else averages['rapor_avg']
+    core_idx = [col[s] for s in CORE_SUBJECTS]
+    core_avg = row_means(grades[:, core_idx], present[:, core_idx], rapor_avg)
     
     # Program-specific averages
-    program = clean_text(row[20])  # SMA Background column
+    is_ipa = (program == 'IPA').to_numpy()
+    is_ips = (program == 'IPS').to_numpy()
+    saintek_idx = [col[s] for s in SAINTEK_SUBJECTS]
+    soshum_idx = [col[s] for s in SOSHUM_SUBJECTS]
+    saintek_avg = row_means(grades[:, saintek_idx], present[:, saintek_idx], rapor_avg)
+    soshum_avg = row_means(grades[:, soshum_idx], present[:, soshum_idx], rapor_avg)
+    program_avg = np.where(is_ipa, saintek_avg, np.where(is_ips, soshum_avg, rapor_avg))
     
-    if program == 'IPA':
-        # SAINTEK subjects
-        saintek_subjects = ['matematika_wajib', 'matematika_peminatan', 'fisika', 'kimia', 'biologi', 'bahasa_indonesia', 'bahasa_inggris']
-        saintek_values = [valid_subjects.get(subj) for subj in saintek_subjects if valid_subjects.get(subj)]
-        averages['program_avg'] = np.mean(saintek_values) if saintek_values else averages['rapor_avg']
-        
-        # Individual subject grades for feature engineering
-        averages['math'] = valid_subjects.get('matematika_peminatan') or valid_subjects.get('matematika_wajib', 0)
-        averages['physics'] = valid_subjects.get('fisika', 0)
-        averages['chemistry'] = valid_subjects.get('kimia', 0)
-        averages['biology'] = valid_subjects.get('biologi', 0)
-        averages['language'] = (valid_subjects.get('bahasa_indonesia', 0) + valid_subjects.get('bahasa_inggris', 0)) / 2
-        
-    elif program == 'IPS':
-        # SOSHUM subjects  
-        soshum_subjects = ['matematika_wajib', 'bahasa_indonesia', 'bahasa_inggris', 'geografi', 'sejarah', 'sosiologi', 'ekonomi']
-        soshum_values = [valid_subjects.get(subj) for subj in soshum_subjects if valid_subjects.get(subj)]
-        averages['program_avg'] = np.mean(soshum_values) if soshum_values else averages['rapor_avg']
-        
-        # Individual subject grades
-        averages['math'] = valid_subjects.get('matematika_wajib', 0)
-        averages['economics'] = valid_subjects.get('ekonomi', 0)
-        averages['geography'] = valid_subjects.get('geografi', 0)
-        averages['history'] = valid_subjects.get('sejarah', 0)
-        averages['language'] = (valid_subjects.get('bahasa_indonesia', 0) + valid_subjects.get('bahasa_inggris', 0)) / 2
-        
-    else:
-        averages['program_avg'] = averages['rapor_avg']
-        averages['math'] = valid_subjects.get('matematika_wajib', 0)
-        averages['language'] = (valid_subjects.get('bahasa_indonesia', 0) + valid_subjects.get('bahasa_inggris', 0)) / 2
-    
-    return averages, valid_subjects
+    return {
+        'rapor_avg': rapor_avg,
+        'core_avg': core_avg,
+        'program_avg': program_avg,
+        'is_ipa': is_ipa,
+        'is_ips': is_ips,
+        'valid': valid,
+        'present': present,
+    }
 
-def determine_program_compatibility(program, major, category):
-    """Determine if program matches the major"""
-    program = clean_text(program)
-    major = clean_text(major)
-    category = clean_text(category)
+def determine_program_compatibility(program: pd.Series, major: pd.Series, category: pd.Series) -> np.ndarray:
+    """Determine if program matches the major (1/0 per student)"""
+    is_ipa = program.eq('IPA').to_numpy()
+    is_ips = program.eq('IPS').to_numpy()
+    ipa_major = major.str.contains(IPA_MAJOR_PATTERN, regex=True, na=False).to_numpy()
     
-    # Simple heuristic based on category and common major patterns
-    if category == 'SCIENTECH':
-        return 1 if program == 'IPA' else 0
-    elif category == 'SOSUM':
-        # SOSUM can be both IPA and IPS depending on the major
-        if any(keyword in major for keyword in ['TEKNIK', 'INFORMATIKA', 'KEDOKTERAN', 'FARMASI', 'BIOLOGI']):
-            return 1 if program == 'IPA' else 0
-        else:
-            return 1 if program == 'IPS' else 0
-    elif category == 'BAHASA':
-        return 1 if program == 'IPS' else 0
-    
-    return 1  # Default: compatible
+    # Simple heuristic based on category and common major patterns;
+    # SOSUM can be both IPA and IPS depending on the major
+    match = np.select(
+        [category.eq('SCIENTECH').to_numpy(), category.eq('SOSUM').to_numpy(), category.eq('BAHASA').to_numpy()],
+        [is_ipa, np.where(ipa_major, is_ipa, is_ips), is_ips],
+        default=True,  # Default: compatible
+    )
+    return match.astype(int)
 
-def create_training_features(student_data):
+def create_training_features(averages: Dict, program_match: int) -> Dict:
     """Create feature set for ML training"""
-    features = {
+    return {
         # Academic performance
-        'rapor_avg': student_data['averages']['rapor_avg'],
-        'core_avg': student_data['averages']['core_avg'],
-        'program_avg': student_data['averages']['program_avg'],
-        'math_score': student_data['averages']['math'],
-        'language_score': student_data['averages']['language'],
+        'rapor_avg': averages['rapor_avg'],
+        'core_avg': averages['core_avg'],
+        'program_avg': averages['program_avg'],
+        'math_score': averages['math'],
+        'language_score': averages['language'],
         
         # Program type
-        'program_saintek': 1 if student_data['program'] == 'IPA' else 0,
-        'program_soshum': 1 if student_data['program'] == 'IPS' else 0,
+        'program_saintek': 1 if averages['program'] == 'IPA' else 0,
+        'program_soshum': 1 if averages['program'] == 'IPS' else 0,
         
         # Program compatibility (feature engineering)
-        'program_match': student_data['program_match'],
+        'program_match': program_match,
         
         # Subject-specific scores (if available)
-        'physics_score': student_data['averages'].get('physics', 0),
-        'chemistry_score': student_data['averages'].get('chemistry', 0),
-        'biology_score': student_data['averages'].get('biologi', 0),
-        'economics_score': student_data['averages'].get('economics', 0),
-        'geography_score': student_data['averages'].get('geography', 0),
-        'history_score': student_data['averages'].get('history', 0),
+        'physics_score': averages.get('physics', 0),
+        'chemistry_score': averages.get('chemistry', 0),
+        'biology_score': averages.get('biologi', 0),
+        'economics_score': averages.get('economics', 0),
+        'geography_score': averages.get('geography', 0),
+        'history_score': averages.get('history', 0),
     }
+
+def build_records(df: pd.DataFrame, grades: np.ndarray, stats: Dict[str, np.ndarray],
+                  program: pd.Series, major: pd.Series, university: pd.Series,
+                  category: pd.Series, program_match: np.ndarray) -> List[Dict]:
+    """Materialize one output record per student from the columnar results"""
+    col = {name: i for i, name in enumerate(SUBJECT_COLUMNS)}
+    grade_rows = grades.tolist()
+    valid_rows = stats['valid'].tolist()
+    present_rows = stats['present'].tolist()
     
-    # Target variable: acceptance (always 1 since these are accepted students)
-    target = 1
-    
-    return features, target
+    records = []
+    for (student_id, prog, maj, uni, cat, match, rapor_avg, core_avg, program_avg,
+         is_ipa, is_ips, row, valid, present) in zip(
+            df.index.tolist(), program.tolist(), major.tolist(), university.tolist(), category.tolist(),
+            program_match.tolist(), stats['rapor_avg'].tolist(), stats['core_avg'].tolist(),
+            stats['program_avg'].tolist(), stats['is_ipa'].tolist(), stats['is_ips'].tolist(),
+            grade_rows, valid_rows, present_rows):
+        # Remove None values
+        valid_subjects = {name: row[i] for i, name in enumerate(SUBJECT_COLUMNS) if valid[i]}
+        
+        def grade(name):
+            return row[col[name]] if valid[col[name]] else 0
+        
+        averages = {'rapor_avg': rapor_avg, 'core_avg': core_avg, 'program_avg': program_avg}
+        language = (grade('bahasa_indonesia') + grade('bahasa_inggris')) / 2
+        if is_ipa:
+            averages['math'] = row[col['matematika_peminatan']] if present[col['matematika_peminatan']] else grade('matematika_wajib')
+            averages['physics'] = grade('fisika')
+            averages['chemistry'] = grade('kimia')
+            averages['biology'] = grade('biologi')
+            averages['language'] = language
+        elif is_ips:
+            averages['math'] = grade('matematika_wajib')
+            averages['economics'] = grade('ekonomi')
+            averages['geography'] = grade('geografi')
+            averages['history'] = grade('sejarah')
+            averages['language'] = language
+        else:
+            averages['math'] = grade('matematika_wajib')
+            averages['language'] = language
+        
+        features = create_training_features({**averages, 'program': prog}, match)
+        
+        records.append({
+            'student_id': student_id,
+            'program': prog,
+            'major': maj,
+            'university': uni,
+            'category': cat,
+            'averages': averages,
+            'valid_subjects': valid_subjects,
+            'program_match': match,
+            'features': features,
+            # Target variable: acceptance (always 1 since these are accepted students)
+            'target': 1
+        })
+    return records
 
 def calculate_statistics(processed_data):
     """Calculate statistics for feature normalization"""
     stats = {}
     
-    # Collect all features
-    all_features = {}
-    for item in processed_data:
-        for key, value in item['features'].items():
-            if key not in all_features:
-                all_features[key] = []
-            all_features[key].append(value)
+    # One (N, F) matrix of all feature values; missing/None values are NaN and ignored.
+    # Column-major so every per-feature reduction runs over contiguous memory (and
+    # sums in the same pairwise order as np.mean over that feature's values)
+    feature_names = list(dict.fromkeys(key for item in processed_data for key in item['features']))
+    matrix = np.array(
+        [[item['features'].get(key) for key in feature_names] for item in processed_data],
+        dtype=np.float64, order='F',
+    ).reshape(len(processed_data), len(feature_names))
     
     # Calculate statistics for each feature
-    for feature, values in all_features.items():
-        values = [v for v in values if v is not None and not np.isnan(v)]
-        if values:
+    valid = ~np.isnan(matrix)
+    if len(matrix) and valid.all():
+        summary = zip(matrix.mean(axis=0), matrix.std(axis=0), matrix.min(axis=0),
+                      matrix.max(axis=0), np.median(matrix, axis=0))
+        for feature, (mean, std, lo, hi, median) in zip(feature_names, summary):
             stats[feature] = {
-                'mean': float(np.mean(values)),
-                'std': float(np.std(values)),
-                'min': float(np.min(values)),
-                'max': float(np.max(values)),
-                'median': float(np.median(values)),
-                'count': len(values)
+                'mean': float(mean),
+                'std': float(std),
+                'min': float(lo),
+                'max': float(hi),
+                'median': float(median),
+                'count': len(matrix)
             }
+    else:
+        for j, feature in enumerate(feature_names):
+            values = matrix[valid[:, j], j]
+            if values.size:
+                stats[feature] = {
+                    'mean': float(np.mean(values)),
+                    'std': float(np.std(values)),
+                    'min': float(np.min(values)),
+                    'max': float(np.max(values)),
+                    'median': float(np.median(values)),
+                    'count': int(values.size)
+                }
     
     # University and major distributions
-    universities = {}
-    majors = {}
-    categories = {}
-    
-    for item in processed_data:
-        uni = item['university']
-        maj = item['major']
-        cat = item['category']
-        
-        universities[uni] = universities.get(uni, 0) + 1
-        majors[maj] = majors.get(maj, 0) + 1
-        categories[cat] = categories.get(cat, 0) + 1
-    
     stats['distributions'] = {
-        'universities': universities,
-        'majors': majors,
-        'categories': categories,
+        'universities': dict(Counter(item['university'] for item in processed_data)),
+        'majors': dict(Counter(item['major'] for item in processed_data)),
+        'categories': dict(Counter(item['category'] for item in processed_data)),
         'total_students': len(processed_data)
     }
     
@@ -208,86 +338,38 @@ def calculate_statistics(processed_data):
 def main():
     print(f"Reading data from: {SRC}")
     
-    # Read Excel file
-    df = pd.read_excel(SRC)
-    print(f"Loaded {len(df)} rows")
-    
-    # Define column names based on our analysis
-    column_names = [
-        'agama', 'ppkn', 'bahasa_indonesia', 'bahasa_inggris', 'matematika_wajib',
-        'seni_budaya', 'pjok', 'prakarya', 'matematika_peminatan', 'fisika',
-        'kimia', 'biologi', 'geografi', 'sejarah', 'sosiologi', 'ekonomi',
-        'sastra_indonesia', 'sastra_inggris', 'bahasa_asing', 'antropologi',
-        'program', 'major', 'university', 'category'
-    ]
-    
-    # Assign proper column names
-    df.columns = column_names[:len(df.columns)]
-    
-    processed_data = []
+    # Stream the sheet in batches and write each processed record as it is ready;
+    # only the fields calculate_statistics needs are kept in memory
+    total_rows = 0
     skipped_rows = 0
+    stat_items = []
+    print(f"Saving processed data to: {OUT_DATA}")
+    with JsonArrayWriter(OUT_DATA) as writer:
+        for chunk in iter_sheet_chunks(SRC):
+            total_rows += len(chunk)
+            records, skipped = process_chunk(chunk)
+            skipped_rows += skipped
+            for record in records:
+                writer.write(record)
+                stat_items.append({key: record[key] for key in ('university', 'major', 'category', 'features')})
     
-    for idx, row in df.iterrows():
-        # Skip rows without major/university info
-        if pd.isna(row.get('major')) or pd.isna(row.get('university')):
-            skipped_rows += 1
-            continue
-            
-        # Calculate averages and extract features
-        averages, valid_subjects = calculate_subject_averages(row.values)
-        
-        # Clean text fields
-        program = clean_text(row.get('program'))
-        major = clean_text(row.get('major'))
-        university = clean_text(row.get('university'))
-        category = clean_text(row.get('category'))
-        
-        # Determine program compatibility
-        program_match = determine_program_compatibility(program, major, category)
-        
-        # Create student data object
-        student_data = {
-            'student_id': idx,
-            'program': program,
-            'major': major,
-            'university': university, 
-            'category': category,
-            'averages': averages,
-            'valid_subjects': valid_subjects,
-            'program_match': program_match
-        }
-        
-        # Create ML features
-        features, target = create_training_features(student_data)
-        
-        processed_item = {
-            **student_data,
-            'features': features,
-            'target': target
-        }
-        
-        processed_data.append(processed_item)
-    
-    print(f"Processed {len(processed_data)} students")
+    print(f"Loaded {total_rows} rows")
+    print(f"Processed {len(stat_items)} students")
     print(f"Skipped {skipped_rows} rows due to missing data")
     
     # Calculate statistics
     print("Calculating statistics...")
-    statistics = calculate_statistics(processed_data)
-    
-    # Save processed data
-    print(f"Saving processed data to: {OUT_DATA}")
-    with open(OUT_DATA, 'w', encoding='utf-8') as f:
-        json.dump(processed_data, f, ensure_ascii=False, indent=2)
+    statistics = calculate_statistics(stat_items)
     
     # Save statistics
     print(f"Saving statistics to: {OUT_STATS}")
-    with open(OUT_STATS, 'w', encoding='utf-8') as f:
-        json.dump(statistics, f, ensure_ascii=False, indent=2)
+    # Small and meant to be read by people, so it stays indented
+    with open(OUT_STATS, 'wb') as f:
+        f.write(json_bytes(statistics, indent=True))
     
     # Print summary statistics
     print("\n=== SUMMARY ===")
-    print(f"Total students processed: {len(processed_data)}")
+    print(f"Total students processed: {len(stat_items)}")
     print(f"Average rapor score: {statistics['rapor_avg']['mean']:.2f}")
     print(f"Universities: {len(statistics['distributions']['universities'])}")
     print(f"Majors: {len(statistics['distributions']['majors'])}")
@@ -1,55 +1,181 @@
-from pydantic import BaseModel, Field, conint, confloat
-from typing import Optional, Literal, List
+from itertools import zip_longest
 
-class PredictRequest(BaseModel):
-    program: Literal["saintek", "soshum"]
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, TypeAdapter, ValidatorFunctionWrapHandler, model_validator
+from typing import Annotated, Any, ClassVar, Dict, FrozenSet, Literal, Optional, Tuple, Union, get_args
+
+Program = Literal["saintek", "soshum"]
+Competitiveness = Literal["very", "high", "mid", "low"]
+Achievement = Literal["none", "school", "prov", "national"]
+Accreditation = Literal["A", "B", "C"]
+Label = Literal["low", "medium", "high"]
+Score = Annotated[float, Field(ge=0, le=100)]
+
+PROGRAMS = get_args(Program)
+COMPETITIVENESS_LEVELS = get_args(Competitiveness)
+
+# semester grades, core subjects, saintek-only, soshum-only
+ScoreKey = Literal[
+    "s1", "s2", "s3", "s4", "s5",
+    "math", "language",
+    "physics", "chemistry", "biology",
+    "economics", "geography", "history",
+]
+SCORE_KEYS = get_args(ScoreKey)
+SaintekScoreKey = Literal["s1", "s2", "s3", "s4", "s5", "math", "language", "physics", "chemistry", "biology"]
+SoshumScoreKey = Literal["s1", "s2", "s3", "s4", "s5", "math", "language", "economics", "geography", "history"]
+SCORE_INDEX = {key: i for i, key in enumerate(SCORE_KEYS)}
+
+def grade_vector(grades: Dict[str, float]) -> np.ndarray:
+    """grades as a float vector in SCORE_KEYS order, NaN where missing"""
+    vec = np.full(len(SCORE_KEYS), np.nan)
+    for key, value in grades.items():
+        vec[SCORE_INDEX[key]] = value
+    return vec
+
+# Legacy numbered target slots, as (university, major) key pairs in preference order
+TARGET_SLOTS = tuple((f"target_university_{i}", f"target_major_{i}") for i in (1, 2, 3))
+
+# What the frontend sends in target_university/target_major when nothing is picked
+TARGET_PLACEHOLDER = "Unknown"
+
+def _target_choice(value: Any) -> Any:
+    """Stripped choice; blanks and the placeholder become "" (non-strings are left for the field to report)"""
+    if isinstance(value, str):
+        value = value.strip()
+        return "" if value == TARGET_PLACEHOLDER else value
+    return value or ""
+
+def fold_targets(numbered, universities, majors, university, major) -> Tuple[tuple, tuple]:
+    """(universities, majors) from the numbered slot pairs, else the two lists, else the legacy single fields.
+
+    Choices are folded as (university, major) pairs: a pair is dropped only when both halves
+    are blank, and a blank half is kept as "", so both tuples stay paired by position.
+    """
+    listed = zip_longest(universities or (), majors or (), fillvalue="")
+    for source in (numbered, listed, ((university, major),)):
+        pairs = [(_target_choice(u), _target_choice(m)) for u, m in source]
+        pairs = [pair for pair in pairs if any(pair)]
+        if pairs:
+            return tuple(u for u, _ in pairs), tuple(m for _, m in pairs)
+    return (), ()
+
+class _PredictRequestBase(BaseModel):
+    """Fields and validation shared by SaintekRequest and SoshumRequest"""
+    # Legacy keys are folded away by the before-validators; anything else is a client error
+    model_config = ConfigDict(extra="forbid")
+
+    score_keys: ClassVar[FrozenSet[str]]  # grade keys the program's requests carry
     
-    # Legacy fields (for backward compatibility)
-    target_major: Optional[str] = None
+    # University/major choices in preference order, paired by position (always the same length)
+    target_universities: Tuple[str, ...] = ()
+    target_majors: Tuple[str, ...] = ()
     
-    # New university-major selection fields
+    competitiveness: Competitiveness
+    _grade_vec: np.ndarray = PrivateAttr()  # grade_vector(grades), packed after validation
+
+    rank_percentile: Annotated[int, Field(ge=1, le=100, description="e.g., 10 means Top10%")] = 100
+    achievement: Achievement = "none"
+    accreditation: Accreditation = "B"
+
+    @model_validator(mode="before")
+    @classmethod
+    def _fold_legacy_targets(cls, data: Any) -> Any:
+        """Collapse target_university(_1.._3)/target_major(_1.._3) into the target tuples"""
+        if not isinstance(data, dict):
+            return data
+        universities, majors = data.get("target_universities"), data.get("target_majors")
+        if not all(listed is None or isinstance(listed, (list, tuple)) for listed in (universities, majors)):
+            return data  # reported by the fields
+        data = dict(data)
+        numbered = [(data.pop(u, None), data.pop(m, None)) for u, m in TARGET_SLOTS]
+        data["target_universities"], data["target_majors"] = fold_targets(
+            numbered, universities, majors, data.pop("target_university", None), data.pop("target_major", None))
+        return data
+
+    @model_validator(mode="before")
+    @classmethod
+    def _fold_legacy_grades(cls, data: Any) -> Any:
+        """Move top-level s1..s5/subject keys (the original payload format) into grades"""
+        if not isinstance(data, dict) or not any(key in data for key in SCORE_KEYS):
+            return data
+        grades = data.get("grades") or {}
+        if not isinstance(grades, dict):
+            return data  # reported by the grades field
+        data, grades = dict(data), dict(grades)
+        for key in SCORE_KEYS:
+            value = data.pop(key, None)
+            # The form sends every subject; the other program's ones were always ignored
+            if value is not None and key in cls.score_keys:
+                grades.setdefault(key, value)
+        data["grades"] = grades
+        return data
+
+    @model_validator(mode="after")
+    def _pack_grades(self) -> "_PredictRequestBase":
+        self._grade_vec = grade_vector(self.grades)
+        return self
+
+    # Defined last so it runs first, ahead of the folding validators above
+    @model_validator(mode="wrap")
+    @classmethod
+    def _check_competitiveness_first(cls, data: Any, handler: ValidatorFunctionWrapHandler) -> "_PredictRequestBase":
+        """Reject a bad competitiveness before any target or grade validation (program is the union tag)"""
+        if isinstance(data, dict) and data.get("competitiveness") not in COMPETITIVENESS_LEVELS:
+            raise ValueError(f"competitiveness must be one of: {', '.join(COMPETITIVENESS_LEVELS)}")
+        return handler(data)
+
+class SaintekRequest(_PredictRequestBase):
+    score_keys: ClassVar[FrozenSet[str]] = frozenset(get_args(SaintekScoreKey))
+
+    program: Literal["saintek"]
+    # grades 0–100; allow missing keys to simulate incomplete inputs
+    grades: Dict[SaintekScoreKey, Score] = Field(default_factory=dict)
+
+class SoshumRequest(_PredictRequestBase):
+    score_keys: ClassVar[FrozenSet[str]] = frozenset(get_args(SoshumScoreKey))
+
+    program: Literal["soshum"]
+    # grades 0–100; allow missing keys to simulate incomplete inputs
+    grades: Dict[SoshumScoreKey, Score] = Field(default_factory=dict)
+
+# pydantic-core picks the branch from the program tag before validating anything else
+PredictRequest = Annotated[Union[SaintekRequest, SoshumRequest], Field(discriminator="program")]
+PROGRAM_SCORE_KEYS = {"saintek": SaintekRequest.score_keys, "soshum": SoshumRequest.score_keys}
+
+class PredictDetails(BaseModel):
+    """The request features a prediction was made from, plus its outcome"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    program: Program
+    target_major: Optional[str] = None
     target_university: Optional[str] = None
-    target_university_1: Optional[str] = None
-    target_university_2: Optional[str] = None
-    target_university_3: Optional[str] = None
-    
-    target_major_1: Optional[str] = None
-    target_major_2: Optional[str] = None
-    target_major_3: Optional[str] = None
-    
-    # Array fields for multiple selections
-    target_universities: Optional[List[str]] = None
-    target_majors: Optional[List[str]] = None
-    
-    competitiveness: Literal["very", "high", "mid", "low"]
-    
-    # semester grades 0–100; allow missing to simulate incomplete inputs
-    s1: Optional[confloat(ge=0, le=100)] = None
-    s2: Optional[confloat(ge=0, le=100)] = None
-    s3: Optional[confloat(ge=0, le=100)] = None
-    s4: Optional[confloat(ge=0, le=100)] = None
-    s5: Optional[confloat(ge=0, le=100)] = None
-
-    # core subjects mean (0–100)
-    math: Optional[confloat(ge=0, le=100)] = None
-    language: Optional[confloat(ge=0, le=100)] = None  # id+en avg (optional)
-
-    # saintek-only
-    physics: Optional[confloat(ge=0, le=100)] = None
-    chemistry: Optional[confloat(ge=0, le=100)] = None
-    biology: Optional[confloat(ge=0, le=100)] = None
-
-    # soshum-only
-    economics: Optional[confloat(ge=0, le=100)] = None
-    geography: Optional[confloat(ge=0, le=100)] = None
-    history: Optional[confloat(ge=0, le=100)] = None
-
-    rank_percentile: conint(ge=1, le=100) = Field(100, description="e.g., 10 means Top10%")
-    achievement: Literal["none", "school", "prov", "national"] = "none"
-    accreditation: Literal["A", "B", "C"] = "B"
+    competitiveness: Competitiveness
+    rapor_avg: Score
+    core_avg: Score
+    rank_percentile: int = 100
+    achievement: Achievement = "none"
+    accreditation: Accreditation = "B"
+    probability: float
+    label: Label
 
 class PredictResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     probability: float
-    label: Literal["low", "medium", "high"]
-    details: dict
-    tips: list[str]
\ No newline at end of file
+    label: Label
+    details: PredictDetails
+    tips: Tuple[str, ...] = ()
+
+# Reused for validate_json straight from the request bytes
+REQUEST_ADAPTER = TypeAdapter(PredictRequest)
+
+# pydantic builds the validators when the classes are created; run them once at
+# import so the first request doesn't pay for their remaining lazy setup
+REQUEST_ADAPTER.validate_python({"program": "saintek", "competitiveness": "low", "s1": 0})
+REQUEST_ADAPTER.validate_python({"program": "soshum", "competitiveness": "low", "s1": 0})
+PredictResponse(
+    probability=0.0, label="low", tips=(),
+    details={"program": "saintek", "competitiveness": "low", "rapor_avg": 0.0, "core_avg": 0.0,
+             "probability": 0.0, "label": "low"},
+).model_dump()
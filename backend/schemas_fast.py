@@ -0,0 +1,81 @@
+from typing import Annotated, Any, Dict, Optional, Tuple, Union
+
+from schemas import (
+    PredictRequest, REQUEST_ADAPTER, Program, Competitiveness, Achievement, Accreditation,
+    ScoreKey, SCORE_KEYS, PROGRAM_SCORE_KEYS, TARGET_SLOTS, fold_targets, grade_vector,
+)
+
+# Optional: C-level payload validation (pip install msgspec)
+try:
+    import msgspec
+except ImportError:
+    msgspec = None  # type: ignore
+
+if msgspec is not None:
+    Score = Annotated[float, msgspec.Meta(ge=0, le=100)]
+
+    # dict=True: _grade_vec is a plain instance attribute, not a field, so no JSON key can set it
+    class PredictRequestStruct(msgspec.Struct, forbid_unknown_fields=True, dict=True):
+        """msgspec mirror of the schemas.PredictRequest union; the endpoints read the same attributes from either"""
+        program: Program
+        competitiveness: Competitiveness
+
+        target_major: Optional[str] = None
+        target_university: Optional[str] = None
+        target_university_1: Optional[str] = None
+        target_university_2: Optional[str] = None
+        target_university_3: Optional[str] = None
+        target_major_1: Optional[str] = None
+        target_major_2: Optional[str] = None
+        target_major_3: Optional[str] = None
+        target_universities: Optional[Tuple[str, ...]] = None
+        target_majors: Optional[Tuple[str, ...]] = None
+
+        grades: Dict[ScoreKey, Score] = {}
+        s1: Optional[Score] = None
+        s2: Optional[Score] = None
+        s3: Optional[Score] = None
+        s4: Optional[Score] = None
+        s5: Optional[Score] = None
+        math: Optional[Score] = None
+        language: Optional[Score] = None
+        physics: Optional[Score] = None
+        chemistry: Optional[Score] = None
+        biology: Optional[Score] = None
+        economics: Optional[Score] = None
+        geography: Optional[Score] = None
+        history: Optional[Score] = None
+
+        rank_percentile: Annotated[int, msgspec.Meta(ge=1, le=100)] = 100
+        achievement: Achievement = "none"
+        accreditation: Accreditation = "B"
+
+        def __post_init__(self):
+            # Fold the legacy target fields and top-level grade keys, as the PredictRequest models do
+            self.target_universities, self.target_majors = fold_targets(
+                [(getattr(self, u), getattr(self, m)) for u, m in TARGET_SLOTS],
+                self.target_universities, self.target_majors, self.target_university, self.target_major)
+            score_keys = PROGRAM_SCORE_KEYS[self.program]
+            if not score_keys.issuperset(self.grades):
+                raise ValueError(f"grades for {self.program} take only: {', '.join(sorted(score_keys))}")
+            for key in SCORE_KEYS:
+                value = getattr(self, key)
+                if value is not None and key in score_keys:
+                    self.grades.setdefault(key, value)
+            self._grade_vec = grade_vector(self.grades)
+
+    # strict=False: accept numeric strings like pydantic's lax mode does
+    _request_decoder = msgspec.json.Decoder(PredictRequestStruct, strict=False)
+
+def decode_predict_request(body: bytes) -> Union[PredictRequest, "PredictRequestStruct"]:
+    """Validated request straight from the JSON body; a PredictRequestStruct when msgspec is installed.
+
+    Bodies msgspec rejects are re-validated by REQUEST_ADAPTER, so clients get the same
+    error (a pydantic ValidationError) whether or not msgspec is installed.
+    """
+    if msgspec is None:
+        return REQUEST_ADAPTER.validate_json(body)
+    try:
+        return _request_decoder.decode(body)
+    except msgspec.DecodeError:
+        return REQUEST_ADAPTER.validate_json(body)
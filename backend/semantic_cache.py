@@ -0,0 +1,105 @@
+from __future__ import annotations
+import json, sqlite3, threading, time
+from typing import Any, Optional
+
+import numpy as np
+
+# Optional: embeddings + vector index (pip install sentence-transformers sqlite-vec)
+try:
+    from sentence_transformers import SentenceTransformer
+except Exception:
+    SentenceTransformer = None  # type: ignore
+
+try:
+    import sqlite_vec
+except Exception:
+    sqlite_vec = None  # type: ignore
+
+DEFAULT_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"  # handles Indonesian
+DEFAULT_THRESHOLD = 0.9   # minimum cosine similarity for a hit
+DEFAULT_TTL = 24 * 3600   # seconds
+
+class SemanticCache:
+    """Reuse stored values for near-duplicate messages.
+
+    Messages are embedded with a sentence-transformers model and looked up in a
+    sqlite-vec index. Entries are partitioned by namespace, so a lookup only
+    ever matches messages stored under the same namespace, and expire after
+    ``ttl`` seconds. Values are stored as JSON, so they must be JSON-serializable.
+    """
+
+    def __init__(self, db_path: str = ":memory:", model_name: str = DEFAULT_MODEL,
+                 threshold: float = DEFAULT_THRESHOLD, ttl: float = DEFAULT_TTL):
+        if SentenceTransformer is None or sqlite_vec is None:
+            raise RuntimeError("semantic cache needs sentence-transformers and sqlite-vec")
+        self.threshold = threshold
+        self.ttl = ttl
+        self.model = SentenceTransformer(model_name)
+        dim = self.model.get_sentence_embedding_dimension()
+
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.enable_load_extension(True)
+        sqlite_vec.load(self.db)
+        self.db.enable_load_extension(False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "id INTEGER PRIMARY KEY, namespace TEXT, created_at REAL, value TEXT)"
+        )
+        self.db.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS entry_vectors USING vec0("
+            f"namespace TEXT PARTITION KEY, embedding FLOAT[{dim}] distance_metric=cosine)"
+        )
+        self.db.commit()
+
+    def embed(self, text: str) -> bytes:
+        vec = self.model.encode(text, normalize_embeddings=True)
+        return np.asarray(vec, dtype=np.float32).tobytes()
+
+    def lookup(self, text: str, namespace: str, embedding: Optional[bytes] = None) -> Optional[Any]:
+        """Stored value of the nearest fresh message in namespace, or None.
+
+        Pass ``embedding`` (from ``embed(text)``) to reuse it for a ``put`` after a miss.
+        """
+        if embedding is None:
+            embedding = self.embed(text)
+        with self._lock:
+            # Purge first so an expired nearest neighbour can't hide a fresh match
+            self._purge_expired(time.time())
+            row = self.db.execute(
+                "SELECT e.value, v.distance FROM entry_vectors v "
+                "JOIN entries e ON e.id = v.rowid "
+                "WHERE v.embedding MATCH ? AND k = 1 AND v.namespace = ?",
+                (embedding, namespace),
+            ).fetchone()
+        if row is None:
+            return None
+        value, distance = row
+        if distance > 1.0 - self.threshold:
+            return None
+        return json.loads(value)
+
+    def put(self, text: str, namespace: str, value: Any, embedding: Optional[bytes] = None) -> None:
+        if embedding is None:
+            embedding = self.embed(text)
+        now = time.time()
+        with self._lock:
+            self._purge_expired(now)
+            cur = self.db.execute(
+                "INSERT INTO entries (namespace, created_at, value) VALUES (?, ?, ?)",
+                (namespace, now, json.dumps(value)),
+            )
+            self.db.execute(
+                "INSERT INTO entry_vectors (rowid, namespace, embedding) VALUES (?, ?, ?)",
+                (cur.lastrowid, namespace, embedding),
+            )
+            self.db.commit()
+
+    def _purge_expired(self, now: float) -> None:
+        expired = [r[0] for r in self.db.execute(
+            "SELECT id FROM entries WHERE created_at < ?", (now - self.ttl,)
+        )]
+        if expired:
+            self.db.executemany("DELETE FROM entry_vectors WHERE rowid = ?", [(i,) for i in expired])
+            self.db.executemany("DELETE FROM entries WHERE id = ?", [(i,) for i in expired])
+            self.db.commit()
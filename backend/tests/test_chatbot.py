@@ -0,0 +1,50 @@
+"""Regression tests for the chatbot's text extraction against the original per-pattern behaviour"""
+
+import pathlib
+import re
+import sys
+
+import pytest
+
+BACKEND = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND))
+
+from chatbot import EducationChatbot, _GRADE_PATTERNS  # noqa: E402
+
+MAJORS_KB_PATH = BACKEND.parent / "kb" / "majors.json"
+
+def baseline_extract_grades(text):
+    """The original extractor: one re.search per pattern, in pattern order"""
+    grades = {}
+    for pattern, subject in _GRADE_PATTERNS:
+        match = re.search(pattern.replace('{value}', r'(\d+(?:[.,]\d+)?)'), text.lower())
+        if match:
+            value = float(match.group(1).replace(',', '.'))
+            if 0 <= value <= 100:
+                grades[subject] = value
+    return grades
+
+@pytest.fixture(scope="module")
+def bot():
+    return EducationChatbot(str(MAJORS_KB_PATH))
+
+@pytest.mark.parametrize("message", [
+    "Rapor saya: matematika 90, biologi 88, kimia 85",
+    "sejarah 80 ekonomi 85 geografi 78 sosiologi 90",
+    "Bahasa Inggris 92, bahasa indonesia 88, Fisika 75, matematika 80",
+    "nilai biologi 70 dan matematika: 95, rata-rata 85",
+    "saya suka olahraga",
+])
+def test_grades_match_baseline(bot, message):
+    grades = bot.extract_grades_from_text(message)
+    expected = baseline_extract_grades(message)
+    assert list(grades) == list(expected)  # the reply breakdown lists them in this order
+    assert grades == expected
+
+def test_grade_breakdown_order(bot):
+    breakdown = bot._format_grade_breakdown(bot.extract_grades_from_text("Rapor saya: matematika 90, biologi 88, kimia 85"))
+    assert breakdown.index("Kimia") < breakdown.index("Biologi")
+
+def test_first_value_per_subject_wins(bot):
+    # The reversed '<nilai> kimia' pattern no longer overwrites kimia with 70
+    assert bot.extract_grades_from_text("matematika 70 kimia 60,5") == {"matematika": 70.0, "kimia": 60.5}
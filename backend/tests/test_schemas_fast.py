@@ -0,0 +1,91 @@
+"""The msgspec decoder must accept and reject exactly what REQUEST_ADAPTER does"""
+
+import json
+import pathlib
+import sys
+
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+msgspec = pytest.importorskip("msgspec")
+
+from schemas import REQUEST_ADAPTER  # noqa: E402
+from schemas_fast import _request_decoder, decode_predict_request  # noqa: E402
+
+VALID = {
+    "program": "saintek", "competitiveness": "mid",
+    "s1": 80, "s2": "85", "math": 90,
+    "target_university": "UI", "target_major": "Kedokteran",
+}
+
+def payload(**changes):
+    """VALID with changes applied; a value of ... removes the key"""
+    data = {**VALID, **changes}
+    return json.dumps({k: v for k, v in data.items() if v is not ...}).encode()
+
+BAD_PAYLOADS = [
+    b"", b"{", b"[]", b"null",
+    payload(_vec=[1.0]), payload(_grade_vec=[1.0]), payload(unknown=1),
+    payload(program="x"), payload(program=...),
+    payload(competitiveness="x"), payload(competitiveness=...),
+    payload(s1=101), payload(s1=-1), payload(s1="abc"), payload(s1=[1]), payload(s1="inf"),
+    payload(grades={"economics": 80}), payload(grades={"unknown": 1}), payload(grades=[1]),
+    payload(grades={"math": None}), payload(grades={"physics": "x"}),
+    payload(rank_percentile=0), payload(rank_percentile=50.5), payload(rank_percentile=None),
+    payload(achievement="x"), payload(accreditation="D"),
+    payload(target_major=1), payload(target_majors="UI"), payload(target_majors=[1]),
+    payload(target_university_1=5),
+]
+
+@pytest.mark.parametrize("body", BAD_PAYLOADS)
+def test_bad_payloads_rejected_by_both(body):
+    with pytest.raises(ValueError) as expected:
+        REQUEST_ADAPTER.validate_json(body)
+    with pytest.raises(msgspec.DecodeError):
+        _request_decoder.decode(body)
+    # The endpoint error text doesn't depend on msgspec being installed
+    with pytest.raises(ValueError) as got:
+        decode_predict_request(body)
+    assert str(got.value) == str(expected.value)
+
+@pytest.mark.parametrize("body", [
+    payload(),
+    payload(s1="85.5", rank_percentile="7", accreditation="A"),
+    payload(program="soshum", economics=80, physics=70),
+    payload(target_universities=["UI", "ITB"], target_majors=["Hukum", "Teknik"]),
+    # Stricter in msgspec than in pydantic's lax mode; decoded by the REQUEST_ADAPTER fallback
+    payload(grades=None), payload(target_universities=["UI", None]),
+])
+def test_good_payloads_decode_alike(body):
+    fast, slow = decode_predict_request(body), REQUEST_ADAPTER.validate_json(body)
+    for attr in ("program", "competitiveness", "target_universities", "target_majors",
+                 "rank_percentile", "achievement", "accreditation"):
+        assert getattr(fast, attr) == getattr(slow, attr), attr
+    assert fast.grades == slow.grades
+    assert fast._grade_vec.tobytes() == slow._grade_vec.tobytes()
+
+# What app.js collectPayload sends when no university or major is picked
+EMPTY_SELECTION = {
+    "target_university": "Unknown", "target_universities": [],
+    "target_university_1": None, "target_university_2": None, "target_university_3": None,
+    "target_major": "Unknown", "target_majors": [],
+    "target_major_1": None, "target_major_2": None, "target_major_3": None,
+}
+
+@pytest.mark.parametrize("body, universities, majors", [
+    (payload(**EMPTY_SELECTION), (), ()),
+    # Numbered slots fold as pairs; a half-blank pair keeps its place
+    (payload(target_university_2="UI", target_major_1="Kedokteran", target_major_2="Hukum"),
+     ("", "UI"), ("Kedokteran", "Hukum")),
+    # Precedence is numbered slots > lists > single fields, also for the first choice
+    (payload(target_university_1="ITB", target_major_1="Teknik", target_universities=["UI"], target_majors=["Hukum"]),
+     ("ITB",), ("Teknik",)),
+    (payload(target_university="UGM", target_major="Farmasi", target_universities=["UI", "ITB"], target_majors=["Hukum"]),
+     ("UI", "ITB"), ("Hukum", "")),
+    (payload(target_university="UGM", target_major="Farmasi"), ("UGM",), ("Farmasi",)),
+])
+def test_target_folding(body, universities, majors):
+    for decode in (decode_predict_request, REQUEST_ADAPTER.validate_json):
+        req = decode(body)
+        assert (req.target_universities, req.target_majors) == (universities, majors)
@@ -0,0 +1,64 @@
+"""SemanticCache partitions by namespace; the chatbot namespaces by extracted major/university"""
+
+import pathlib
+import sqlite3
+import sys
+
+import pytest
+
+BACKEND = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND))
+
+import semantic_cache  # noqa: E402
+from chatbot import EducationChatbot  # noqa: E402
+
+MAJORS_KB_PATH = BACKEND.parent / "kb" / "majors.json"
+
+pytestmark = pytest.mark.skipif(
+    semantic_cache.sqlite_vec is None or not hasattr(sqlite3.Connection, "enable_load_extension"),
+    reason="needs sqlite-vec and a sqlite3 build that can load extensions",
+)
+
+class StubEmbedder:
+    """Every text gets the same unit vector, so only the namespace can keep entries apart"""
+    calls = 0
+
+    def __init__(self, model_name):
+        pass
+
+    def get_sentence_embedding_dimension(self):
+        return 4
+
+    def encode(self, text, normalize_embeddings=True):
+        StubEmbedder.calls += 1
+        return [1.0, 0.0, 0.0, 0.0]
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(semantic_cache, "SentenceTransformer", StubEmbedder)
+    StubEmbedder.calls = 0
+    return semantic_cache.SemanticCache()
+
+def test_namespaces_never_cross(cache):
+    cache.put("ingin masuk kedokteran UI", "major_preparation|kedokteran|Universitas Indonesia", {"campus": "UI"})
+    assert cache.lookup("ingin masuk kedokteran UGM", "major_preparation|kedokteran|Universitas Gadjah Mada") is None
+    assert cache.lookup("info jurusan farmasi", "major_info|farmasi|") is None
+    assert cache.lookup("ingin masuk kedokteran UI", "major_preparation|kedokteran|Universitas Indonesia") == {"campus": "UI"}
+
+def test_lookup_embedding_reused_by_put(cache):
+    embedding = cache.embed("info jurusan kedokteran")
+    assert cache.lookup("info jurusan kedokteran", "major_info|kedokteran|", embedding) is None
+    cache.put("info jurusan kedokteran", "major_info|kedokteran|", {"major": "kedokteran"}, embedding)
+    assert StubEmbedder.calls == 1
+
+@pytest.mark.parametrize("first, second", [
+    ("ingin masuk kedokteran UI", "ingin masuk kedokteran UGM"),
+    ("info jurusan kedokteran", "info jurusan farmasi"),
+])
+def test_chatbot_paraphrase_keeps_major_and_campus(cache, first, second):
+    cached_bot = EducationChatbot(str(MAJORS_KB_PATH), semantic_cache=cache)
+    plain_bot = EducationChatbot(str(MAJORS_KB_PATH))
+    cached_bot.process_message(first)
+    assert cached_bot.process_message(second) == plain_bot.process_message(second)
+    # A miss embeds the message once, for both the lookup and the put
+    assert StubEmbedder.calls == 2
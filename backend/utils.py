@@ -1,11 +1,20 @@
 from typing import List, Optional
 
+import numpy as np
+
 def average(nums: List[Optional[float]]) -> Optional[float]:
     vals = [x for x in nums if isinstance(x, (int, float))]
     if not vals:
         return None
     return sum(vals) / len(vals)
 
+def nan_average(values: np.ndarray) -> Optional[float]:
+    """average() for a float array with NaN marking missing values"""
+    present = values[~np.isnan(values)]
+    if not present.size:
+        return None
+    return float(present.mean())
+
 def decision_label(p: float) -> str:
     if p >= 0.75:
         return "high"
@@ -13,7 +22,7 @@ def decision_label(p: float) -> str:
         return "medium"
     return "low"
 
-def recommendations(prob: float, context: dict) -> list[str]:
+def recommendations(prob: float, context: dict) -> tuple[str, ...]:
     tips = []
     if context.get("core_avg", 100) < 85:
         tips.append("Improve core subject average to ≥85, focusing on Math and major-related subjects.")
@@ -27,4 +36,4 @@ def recommendations(prob: float, context: dict) -> list[str]:
         tips.append("Consider a less competitive major as a safety option.")
     if context.get("accreditation", "B") == "C":
         tips.append("Consider certificates/enrichment to offset school accreditation.")
-    return tips
+    return tuple(tips)